@@ -1,13 +1,43 @@
 import json
+import copy
+import sqlite3
+import hashlib
+import shutil
+import tempfile
+import zlib
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
 import os
 import re
-from lightgbm import LGBMRegressor
+import lightgbm as lgb
+try:
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    HistGradientBoostingRegressor = None
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+try:
+    import catboost
+except ImportError:
+    catboost = None
 import cloudpickle
 import sys
 import certifi
 import urllib3
 import logging
+import multiprocessing
+import itertools
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import time
 from datetime import datetime
 
 from matplotlib.figure import Figure
@@ -15,14 +45,14 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 
 from numerapi import NumerAPI
-from numerai_tools.scoring import numerai_corr, correlation_contribution
+from scipy.special import ndtri
 
 from PySide6.QtGui import QPixmap, QValidator
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QFileSystemWatcher, QObject, QThread, Signal, Slot
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QSplitter, QWidget, QListWidget, QTableWidgetItem, QListWidgetItem, QTableWidget, QSizePolicy, QAbstractItemView, QSizePolicy, QComboBox,
     QVBoxLayout, QHBoxLayout, QTextEdit, QLineEdit, QFileDialog,
-    QLabel, QPushButton, QMessageBox,QStackedWidget,QLayout
+    QLabel, QPushButton, QMessageBox,QStackedWidget,QLayout, QCheckBox, QProgressBar
 )
 
 http = urllib3.PoolManager(
@@ -30,6 +60,51 @@ http = urllib3.PoolManager(
     ca_certs=certifi.where()
 )
 
+# Folder created inside the dataset folder to hold cached artifacts
+CACHE_FOLDER_NAME = ".numerai_cache"
+# Folder inside the dataset folder holding the experiment store, kept apart from the cache so Clear Cache leaves it
+EXPERIMENT_FOLDER_NAME = ".numerai_experiments"
+# Rows of the experiment store shown per page on the results page
+EXPERIMENT_PAGE_SIZE = 50
+# Columns the experiment store results can be ordered by, best first
+EXPERIMENT_ORDER_COLUMNS = ("corr_mean", "mmc_mean", "corr_sharpe", "mmc_sharpe", "created_at")
+# File types listed in the downloaded datasets list
+DATASET_FILE_EXTENSIONS = ('.csv', '.parquet', '.json', '.xlsx', '.db', '.sqlite', '.sqlite3')
+# Total size of cached prepared frames kept on disk before the least recently used are evicted
+PREPARED_FRAME_CACHE_MAX_BYTES = 20 * 1024 ** 3
+# Total size of cached trained models, predictions and scores kept on disk before the least recently used are evicted
+TRAINED_MODEL_CACHE_MAX_BYTES = 5 * 1024 ** 3
+# Trained models of the session kept in memory, the least recently used beyond either limit are spilled to disk
+MODEL_POOL_MAX_MODELS = 20
+MODEL_POOL_MAX_BYTES = 1024 ** 3
+# LightGBM parameters that change how the training Dataset is binned
+LIGHTGBM_BIN_PARAMETERS = (
+    "max_bin", "max_bin_by_feature", "min_data_in_bin", "bin_construct_sample_cnt", "subsample_for_bin",
+    "feature_pre_filter", "min_data_in_leaf", "min_child_samples", "use_missing", "zero_as_missing",
+    "categorical_feature", "linear_tree", "data_random_seed",
+)
+# Number of rows predicted at once, bounding the size of the feature copy made for each batch
+PREDICTION_BATCH_SIZE = 100_000
+# Trailing training eras held out to decide when LightGBM stops adding trees
+EARLY_STOPPING_HOLDOUT_ERAS = 52
+# Eras dropped between the fit rows and the early stopping holdout, targets look 4 eras ahead
+EARLY_STOPPING_EMBARGO_ERAS = 4
+# Ways of turning the values entered for each hyperparameter into grid rows
+SEARCH_STRATEGIES = ("Paired rows", "Cartesian product", "Random sample", "Successive halving", "Hyperband")
+# Default share of configurations dropped at each successive halving round is 1 - 1/factor
+HALVING_FACTOR = 3
+# Fewest training eras a successive halving round is allowed to train on
+HALVING_MIN_ERAS = 8
+# Summary statistics of the per-era CORR and MMC, in the order of the results table
+RESULT_SCORE_COLUMNS = [
+    "corr_mean", "mmc_mean", "corr_std", "mmc_std", "corr_sharpe", "mmc_sharpe", "corr_max_drawdown", "mmc_max_drawdown"
+]
+# LightGBM objectives whose prediction is the raw score, so staged raw scores can be summed
+LIGHTGBM_IDENTITY_OBJECTIVES = (
+    "regression", "regression_l2", "l2", "mean_squared_error", "mse", "l2_root", "root_mean_squared_error", "rmse",
+    "regression_l1", "l1", "mean_absolute_error", "mae", "huber", "fair", "quantile", "mape", "mean_absolute_percentage_error",
+)
+
 class Platform(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -41,6 +116,14 @@ class Platform(QWidget):
         self.num_of_features = None
         self.live_features_stored = None   
         self.trained_models = {}
+        self.model_pool = ModelPool()
+        self.feature_metadata = FeatureMetadataIndex()
+        self.lightgbm_dataset_cache = LightGBMDatasetCache()
+        self.sweep_thread = None
+        self.sweep_worker = None
+        self.dataset_manifest = None
+        self.dataset_folder_watcher = QFileSystemWatcher(self)
+        self.dataset_folder_watcher.directoryChanged.connect(self.function_dataset_folder_changed)
 
         #Intiate Layouts
         self.initialize_Core_layouts()
@@ -311,6 +394,8 @@ class Platform(QWidget):
             self.browse_button = self.function_create_button("Folder Browse", left_column_layout,self.button_function_browse_folder, styles["left_column"]["button"])
 
             self.button_download_data_set_selected = self.function_create_button("Download Selected Datasets", left_column_layout, self.button_function_download_selected_dataset,styles["left_column"]["button"])
+
+            self.button_clear_cache = self.function_create_button("Clear Cache", left_column_layout, self.button_function_clear_cache, styles["left_column"]["button"])
             
             self.function_create_label("Downloaded Datasets", left_column_layout,styles["left_column"]["label"])
 
@@ -407,90 +492,133 @@ class Platform(QWidget):
             self.function_create_label("Training Module - Select One", left_column_layout, label_style)
             self.training_method_combo = QComboBox()
             self.training_method_combo.setStyleSheet(combobox_style)
-            self.training_method_combo.addItems(["LGBMRegressor", "HistGradientBoostingRegressor"])
+            self.training_method_combo.addItems([backend.name for backend in available_estimator_backends()])
             self.training_method_combo.currentIndexChanged.connect(self.function_training_method_changed)
             left_column_layout.addWidget(self.training_method_combo)
             
-            # Create container for LGBMRegressor hyperparameters
-            self.container_LGM = QWidget()
-            self.hyperparameters_layout_LGM = QVBoxLayout(self.container_LGM)
-            self.n_estimators = self.function_create_labeled_lineedit(
-                "Number of boosted trees to fit",
-                self.hyperparameters_layout_LGM,
-                "Please input Integer values like 2000. For multiple values, separate them with commas like 2000, 3000",
+            # Create a hidden container with the hyperparameters declared by each training method
+            self.hyperparameter_containers = {}
+            self.hyperparameter_lineedits = {}
+            for backend in available_estimator_backends():
+                container = QWidget()
+                container_layout = QVBoxLayout(container)
+                self.hyperparameter_lineedits[backend.name] = {
+                    key: self.function_create_labeled_lineedit(label, container_layout, placeholder, DelimitedValidator)
+                    for key, label, placeholder, _ in backend.hyperparameter_schema
+                }
+                container.setVisible(False)
+                left_column_layout.addWidget(container)
+                self.hyperparameter_containers[backend.name] = container
+
+            # How the values entered above are turned into grid rows
+            self.function_create_label("Search Strategy", left_column_layout, label_style)
+            self.search_strategy_combo = QComboBox()
+            self.search_strategy_combo.setStyleSheet(combobox_style)
+            self.search_strategy_combo.addItems(SEARCH_STRATEGIES)
+            left_column_layout.addWidget(self.search_strategy_combo)
+            self.search_budget = self.function_create_labeled_lineedit(
+                "Search budget (optional)",
+                left_column_layout,
+                "Please input an Integer like 200 to sample 200 combinations for the random, halving and Hyperband searches. Leave empty to use every combination",
                 DelimitedValidator
             )
-            self.learning_rate = self.function_create_labeled_lineedit(
-                "Boosting learning rate",
-                self.hyperparameters_layout_LGM,
-                "Please input float values like 0.01. For multiple values, separate them with commas like 0.01, 0.02",
+            self.halving_factor = self.function_create_labeled_lineedit(
+                "Halving factor (optional)",
+                left_column_layout,
+                f"Please input an Integer like 3 to keep the best third of the configurations after each halving round. Leave empty to use {HALVING_FACTOR}",
                 DelimitedValidator
             )
-            self.max_depth = self.function_create_labeled_lineedit(
-                "Maximum tree depth for base learners",
-                self.hyperparameters_layout_LGM,
-                "Please input Integer values like 5. For multiple values, separate them with commas like 5, 6",
+            
+            # Era stride and window used to subsample the training eras at read time
+            self.training_era_stride = self.function_create_labeled_lineedit(
+                "Training era stride (optional)",
+                left_column_layout,
+                "Please input an Integer like 4 to train on every 4th era. Leave empty to use every era",
                 DelimitedValidator
             )
-            self.num_leaves = self.function_create_labeled_lineedit(
-                "Maximum tree leaves for base learners",
-                self.hyperparameters_layout_LGM,
-                "Please input Integer values like 30. For multiple values, separate them with commas like 30, 31",
+            self.training_era_start = self.function_create_labeled_lineedit(
+                "Training first era (optional)",
+                left_column_layout,
+                "Please input an era number like 0001. Leave empty to start at the first training era",
                 DelimitedValidator
             )
-            self.colsample_bytree = self.function_create_labeled_lineedit(
-                "Subsample ratio of columns when constructing each tree",
-                self.hyperparameters_layout_LGM,
-                "Please input float values like 0.1. For multiple values, separate them with commas like 0.1, 0.25",
+            self.training_era_end = self.function_create_labeled_lineedit(
+                "Training last era (optional)",
+                left_column_layout,
+                "Please input an era number like 0500. Leave empty to stop at the last training era",
                 DelimitedValidator
             )
-            
-            # Initially hide the LGBM container
-            self.container_LGM.setVisible(False)
-            left_column_layout.addWidget(self.container_LGM)
-            
-            # Create container for HistGradientBoostingRegressor hyperparameters
-            self.container_HGBR = QWidget()
-            self.hist_gradient_boosting_layout = QVBoxLayout(self.container_HGBR)
-            self.learning_rate_sci = self.function_create_labeled_lineedit(
-                "Learning Rate",
-                self.hist_gradient_boosting_layout,
-                "Please input float values like 0.01. For multiple values, separate them with commas like 0.01, 0.02",
+
+            # Optional era window used to score only recent validation eras
+            self.validation_era_start = self.function_create_labeled_lineedit(
+                "Validation first era (optional)",
+                left_column_layout,
+                "Please input an era number like 0800. Leave empty to start at the first validation era",
+                DelimitedValidator
+            )
+            self.validation_era_end = self.function_create_labeled_lineedit(
+                "Validation last era (optional)",
+                left_column_layout,
+                "Please input an era number like 1100. Leave empty to stop at the last validation era",
                 DelimitedValidator
             )
-            self.max_iter_sci = self.function_create_labeled_lineedit(
-                "Max Number of Trees",
-                self.hist_gradient_boosting_layout,
-                "Please input Integer values like 2000. For multiple values, separate them with commas like 2000, 3000",
+
+            # Rows predicted per batch on the validation data
+            self.prediction_batch_size = self.function_create_labeled_lineedit(
+                "Prediction batch size (optional)",
+                left_column_layout,
+                f"Please input an Integer like 50000. Leave empty to predict {PREDICTION_BATCH_SIZE} rows at a time",
                 DelimitedValidator
             )
-            self.max_leaf_nodes_sci = self.function_create_labeled_lineedit(
-                "Max Num of leaves per Tree",
-                self.hist_gradient_boosting_layout,
-                "Please input Integer values like 31. For multiple values, separate them with commas like 30, 31",
+
+            # Number of processes training grid rows at the same time
+            self.parallel_processes = self.function_create_labeled_lineedit(
+                "Parallel training processes (optional)",
+                left_column_layout,
+                "Please input an Integer like 8 to train 8 models at once. Leave empty to train one model at a time",
                 DelimitedValidator
             )
-            self.max_depth_sci = self.function_create_labeled_lineedit(
-                "Max Depth of Tree",
-                self.hist_gradient_boosting_layout,
-                "Please input Integer values like 5. For multiple values, separate them with commas like 5, 6",
+
+            # Early stopping on a trailing, embargoed block of training eras
+            self.early_stopping_rounds = self.function_create_labeled_lineedit(
+                "LightGBM early stopping rounds (optional)",
+                left_column_layout,
+                "Please input an Integer like 300 to stop once holdout correlation has not improved for 300 trees. Leave empty to train every tree",
                 DelimitedValidator
             )
-            self.max_features_sci = self.function_create_labeled_lineedit(
-                "Proportion of random chosen features in each node split",
-                self.hist_gradient_boosting_layout,
-                "Please input float values like 0.1. For multiple values, separate them with commas like 0.1, 0.2",
+            self.early_stopping_eras = self.function_create_labeled_lineedit(
+                "Early stopping holdout eras (optional)",
+                left_column_layout,
+                f"Please input the number of trailing training eras to hold out. Leave empty to hold out {EARLY_STOPPING_HOLDOUT_ERAS}",
                 DelimitedValidator
             )
-            
-            # Initially hide the HistGradientBoostingRegressor container
-            self.container_HGBR.setVisible(False)
-            left_column_layout.addWidget(self.container_HGBR)
-            
+
+            # Opt-in compact dtypes for the training and validation frames
+            self.compact_dtypes_checkbox = QCheckBox("Compact dtypes (int8 features, float32 targets, categorical era)")
+            self.compact_dtypes_checkbox.setStyleSheet(label_style)
+            left_column_layout.addWidget(self.compact_dtypes_checkbox)
+
+            # Keep the binned LightGBM training Dataset on disk for later sessions
+            self.save_lightgbm_binary_checkbox = QCheckBox("Save binned LightGBM training data for later sessions")
+            self.save_lightgbm_binary_checkbox.setStyleSheet(label_style)
+            left_column_layout.addWidget(self.save_lightgbm_binary_checkbox)
+
             # Create download button
-            self.button_download_data_set_selected = self.function_create_button(
+            self.button_train_multi_models = self.function_create_button(
                 "Train Multi Models", left_column_layout, self.function_Multiple_Train_Buttons, button_style
             )
+
+            # Progress of the running sweep and a button to stop it
+            self.sweep_status_label = QLabel("")
+            self.sweep_status_label.setStyleSheet(label_style)
+            left_column_layout.addWidget(self.sweep_status_label)
+            self.sweep_progress_bar = QProgressBar()
+            self.sweep_progress_bar.setValue(0)
+            left_column_layout.addWidget(self.sweep_progress_bar)
+            self.button_cancel_sweep = self.function_create_button(
+                "Cancel", left_column_layout, self.function_cancel_sweep, button_style
+            )
+            self.button_cancel_sweep.setEnabled(False)
             
             left_column_layout.setAlignment(Qt.AlignTop)
             layout.addLayout(left_column_layout)
@@ -583,6 +711,15 @@ class Platform(QWidget):
             page_widget = QWidget()
             layout = QVBoxLayout(page_widget)
 
+            # Re-score every trained model against the selected meta model file
+            self.button_rescore_models = self.function_create_button(
+                "Re-score Models With Selected Meta Model", layout, self.function_rescore_trained_models
+            )
+
+            # Export LightGBM models as model text, feature manifest and a small predict pickle
+            self.lean_export_checkbox = QCheckBox("Lean native model export (LightGBM model text, feature manifest, small predict pickle)")
+            layout.addWidget(self.lean_export_checkbox)
+
             # Add table widget
             self.table_widget_multi_results = QTableWidget()
             self.table_widget_multi_results.setStyleSheet(styles["table"])
@@ -606,6 +743,44 @@ class Platform(QWidget):
 
             # Connect table selection signal to update graphs
             self.table_widget_multi_results.itemSelectionChanged.connect(self.function_update_graphs)
+
+            # Results of earlier sweeps saved in the experiment store, filtered and read one page at a time
+            filter_layout = QHBoxLayout()
+            filter_layout.addWidget(QLabel("Saved experiments  Method:"))
+            self.experiment_method_combo = QComboBox()
+            self.experiment_method_combo.addItem("All")
+            filter_layout.addWidget(self.experiment_method_combo)
+            self.experiment_min_corr_mean = QLineEdit()
+            self.experiment_min_corr_mean.setPlaceholderText("Min corr_mean")
+            filter_layout.addWidget(self.experiment_min_corr_mean)
+            self.experiment_min_mmc_mean = QLineEdit()
+            self.experiment_min_mmc_mean.setPlaceholderText("Min mmc_mean")
+            filter_layout.addWidget(self.experiment_min_mmc_mean)
+            filter_layout.addWidget(QLabel("Order by:"))
+            self.experiment_order_combo = QComboBox()
+            self.experiment_order_combo.addItems(EXPERIMENT_ORDER_COLUMNS)
+            filter_layout.addWidget(self.experiment_order_combo)
+            self.function_create_button("Apply Filters", filter_layout, lambda: self.function_refresh_experiments(page=0))
+            layout.addLayout(filter_layout)
+
+            self.table_widget_experiments = QTableWidget()
+            self.table_widget_experiments.setStyleSheet(styles["table"])
+            self.table_widget_experiments.setSelectionBehavior(QAbstractItemView.SelectRows)
+            self.table_widget_experiments.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            self.table_widget_experiments.itemSelectionChanged.connect(self.function_show_experiment_graphs)
+            layout.addWidget(self.table_widget_experiments)
+
+            paging_layout = QHBoxLayout()
+            self.function_create_button("Previous", paging_layout, lambda: self.function_refresh_experiments(page=self.experiment_page - 1))
+            self.experiment_page_label = QLabel("")
+            self.experiment_page_label.setAlignment(Qt.AlignCenter)
+            paging_layout.addWidget(self.experiment_page_label)
+            self.function_create_button("Next", paging_layout, lambda: self.function_refresh_experiments(page=self.experiment_page + 1))
+            layout.addLayout(paging_layout)
+
+            self.experiment_page = 0
+            self.experiment_page_results = pd.DataFrame()
+            self.function_refresh_experiments(page=0)
         
             return page_widget
         except Exception as e:
@@ -677,41 +852,130 @@ class Platform(QWidget):
             selected_indexes = self.table_widget_multi_results.selectedIndexes()
             if selected_indexes:
                 selected_row = selected_indexes[0].row()  # Assuming single selection
-                (results_df, model, validation, Performance_validation, per_era_corr, per_era_mmc) = self.trained_models[selected_row]
-
-                # Clear existing plots from the Figure objects associated with graph_widget_1 and graph_widget_2
-                self.graph_widget_1.figure.clear()
-                self.graph_widget_2.figure.clear()
-
-                # Plot cumulative validation CORR
-                ax1 = self.graph_widget_1.figure.add_subplot(111)
-                per_era_corr.cumsum().plot(
-                    ax=ax1,
-                    title="Cumulative Validation CORR",
-                    kind="line",
-                    legend=False
-                )
-                # Use subplots_adjust to manually set margins
-                self.graph_widget_1.figure.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
-
-                # Plot cumulative validation MMC
-                ax2 = self.graph_widget_2.figure.add_subplot(111)
-                per_era_mmc.cumsum().plot(
-                    ax=ax2,
-                    title="Cumulative Validation MMC",
-                    kind="line",
-                    legend=False
-                )
-                # Use subplots_adjust to manually set margins
-                self.graph_widget_2.figure.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+                model_result = self.trained_models[selected_row]
+                self.function_plot_per_era_scores(model_result.per_era_corr, model_result.per_era_mmc)
 
-                # Redraw the graph widgets to reflect the changes
-                self.graph_widget_1.draw()
-                self.graph_widget_2.draw()
-                
                 # Populate table widget
-                self.setup_validation_results_table(validation)
-                
+                self.setup_validation_results_table(model_result.validation_frame())
+
+    def function_plot_per_era_scores(self, per_era_corr, per_era_mmc):
+        """
+        Plots the cumulative per-era CORR and MMC of one model in the two result graphs.
+        """
+        # Clear existing plots from the Figure objects associated with graph_widget_1 and graph_widget_2
+        self.graph_widget_1.figure.clear()
+        self.graph_widget_2.figure.clear()
+
+        # Plot cumulative validation CORR
+        ax1 = self.graph_widget_1.figure.add_subplot(111)
+        per_era_corr.cumsum().plot(
+            ax=ax1,
+            title="Cumulative Validation CORR",
+            kind="line",
+            legend=False
+        )
+        # Use subplots_adjust to manually set margins
+        self.graph_widget_1.figure.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+
+        # Plot cumulative validation MMC
+        ax2 = self.graph_widget_2.figure.add_subplot(111)
+        per_era_mmc.cumsum().plot(
+            ax=ax2,
+            title="Cumulative Validation MMC",
+            kind="line",
+            legend=False
+        )
+        # Use subplots_adjust to manually set margins
+        self.graph_widget_2.figure.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+
+        # Redraw the graph widgets to reflect the changes
+        self.graph_widget_1.draw()
+        self.graph_widget_2.draw()
+
+    def function_experiment_store_exists(self) -> bool:
+        return os.path.exists(os.path.join(self.dynamic_folder_path, EXPERIMENT_FOLDER_NAME, "experiments.sqlite"))
+
+    def function_refresh_experiments(self, page=0) -> None:
+        """
+        Shows one page of the saved experiments matching the filters of the results page.
+
+        Only the summary rows of the page are read from the experiment store; per-era series
+        are read when a row is selected.
+        """
+        min_values = {}
+        for name, lineedit in (("min_corr_mean", self.experiment_min_corr_mean), ("min_mmc_mean", self.experiment_min_mmc_mean)):
+            text = lineedit.text().strip()
+            try:
+                min_values[name] = float(text) if text else None
+            except ValueError:
+                QMessageBox.warning(self, "Invalid Input", f"{lineedit.placeholderText()} must be a number.")
+                return
+        method = self.experiment_method_combo.currentText()
+        query = {"method": None if method == "All" else method, "order_by": self.experiment_order_combo.currentText(), **min_values}
+
+        page = max(page, 0)
+        page_results, total = pd.DataFrame(), 0
+        if self.function_experiment_store_exists():
+            try:
+                experiment_store = ExperimentStore(self.dynamic_folder_path)
+                try:
+                    page_results, total = experiment_store.query_results(page=page, **query)
+                    last_page = max(math.ceil(total / EXPERIMENT_PAGE_SIZE) - 1, 0)
+                    if page > last_page:
+                        page = last_page
+                        page_results, total = experiment_store.query_results(page=page, **query)
+                    methods = experiment_store.methods()
+                finally:
+                    experiment_store.close()
+            except Exception as e:
+                print(f"Error reading the experiment store: {e}")
+                return
+
+            # Keep the method filter in step with the stored methods
+            self.experiment_method_combo.blockSignals(True)
+            self.experiment_method_combo.clear()
+            self.experiment_method_combo.addItems(["All"] + methods)
+            self.experiment_method_combo.setCurrentText(method if method in methods else "All")
+            self.experiment_method_combo.blockSignals(False)
+
+        self.experiment_page = page
+        self.experiment_page_results = page_results
+        self.helper_function_clear_table_widget(self.table_widget_experiments)
+        self.table_widget_experiments.setColumnCount(len(page_results.columns))
+        self.table_widget_experiments.setHorizontalHeaderLabels(list(page_results.columns))
+        self.table_widget_experiments.setRowCount(len(page_results))
+        for row_num, row in enumerate(page_results.itertuples(index=False)):
+            for j, (column, value) in enumerate(zip(page_results.columns, row)):
+                text = f"{value:.6f}" if column in RESULT_SCORE_COLUMNS and pd.notna(value) else ("" if pd.isna(value) else str(value))
+                self.table_widget_experiments.setItem(row_num, j, QTableWidgetItem(text))
+
+        first = self.experiment_page * EXPERIMENT_PAGE_SIZE
+        self.experiment_page_label.setText(
+            f"{first + 1}-{first + len(page_results)} of {total} saved results" if total else "No saved results"
+        )
+
+    def function_show_experiment_graphs(self) -> None:
+        """
+        Reads the per-era series and validation predictions of the selected saved experiment
+        and shows them like a result of the current session.
+        """
+        selected_indexes = self.table_widget_experiments.selectedIndexes()
+        if not selected_indexes or self.experiment_page_results.empty:
+            return
+        result_id = int(self.experiment_page_results["result_id"].iloc[selected_indexes[0].row()])
+        try:
+            experiment_store = ExperimentStore(self.dynamic_folder_path)
+            try:
+                per_era_corr, per_era_mmc = experiment_store.load_per_era(result_id)
+                validation_predictions = experiment_store.load_validation_predictions(result_id)
+            finally:
+                experiment_store.close()
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Error reading saved result {result_id}: {e}")
+            return
+        self.function_plot_per_era_scores(per_era_corr, per_era_mmc)
+        self.setup_validation_results_table(validation_predictions)
+
     def function_create_label(self, text: str, parent_layout, style = None)-> None:
         label = QLabel(text)
         label.setFixedHeight(20)
@@ -779,7 +1043,7 @@ class Platform(QWidget):
         # Store the table widget as an instance variable
         setattr(self, table_name, table_widget)
 
-    def function_create_button(self, text: str, parent_layout, clicked_handler=None, style = None) -> None:
+    def function_create_button(self, text: str, parent_layout, clicked_handler=None, style = None) -> QPushButton:
         button = QPushButton(text)
         button.setFixedHeight(30) 
         if style:
@@ -788,6 +1052,7 @@ class Platform(QWidget):
             button.clicked.connect(clicked_handler)
              
         parent_layout.addWidget(button)
+        return button
          
     def function_handle_feature_list_change(self, selected_item):
         """
@@ -816,10 +1081,7 @@ class Platform(QWidget):
 
             try:
                 if file_extension_feature_file == ".json":
-                    with open(full_file_path_feature_file, 'r') as file:
-                        feature_metadata = json.load(file)
-                        selected_feature_sets = feature_metadata["feature_sets"][self.selected_feature_set]
-                        self.num_of_features = len(selected_feature_sets)
+                    self.num_of_features = self.feature_metadata.feature_set_sizes(full_file_path_feature_file)[self.selected_feature_set]
             except FileNotFoundError:
                 print(f"File not found: {full_file_path_feature_file}")
             except json.JSONDecodeError:
@@ -891,6 +1153,7 @@ class Platform(QWidget):
                 self.folder_path_edit.setText(folder_path)
                 self.function_update_downloaded_datasets_list(folder_path)
                 self.dynamic_folder_path = folder_path
+                self.function_refresh_experiments(page=0)
             else:
                 # Optionally, you can add a message indicating no changes were made
                 QMessageBox.information(self, "No Change", "The folder path was not changed.")
@@ -899,17 +1162,45 @@ class Platform(QWidget):
             # Inform the user if no folder was selected
             QMessageBox.warning(self, "No Folder Selected", "No folder was selected. Please try again.")
         
+    def function_get_cache_folder_path(self, *sub_folders):
+        """
+        Returns a folder inside the cache folder of the current dataset folder.
+        """
+        return os.path.join(self.dynamic_folder_path, CACHE_FOLDER_NAME, *sub_folders)
+
+    def button_function_clear_cache(self):
+        cache_folder = self.function_get_cache_folder_path()
+        if not os.path.exists(cache_folder):
+            print("Cache is already empty.")
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Clear Cache",
+            f"Do you want to delete all cached files in:\n{cache_folder}?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.No:
+            return
+
+        freed_bytes = sum(
+            os.path.getsize(os.path.join(root, file)) for root, dirs, files in os.walk(cache_folder) for file in files
+        )
+        try:
+            shutil.rmtree(cache_folder)
+            print(f"Cleared cache folder {cache_folder}, {freed_bytes / 1024 ** 2:.1f} MB freed")
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Error clearing cache: {e}")
+
     def function_training_method_changed(self, index):
         """
         Show or hide hyperparameter sections based on the selected training method.
         """
         try:
-            if index == 0:  # LGBMRegressor
-                self.container_LGM.setVisible(True)
-                self.container_HGBR.setVisible(False)
-            elif index == 1:  # HistGradientBoostingRegressor
-                self.container_LGM.setVisible(False)
-                self.container_HGBR.setVisible(True)
+            selected_method = self.training_method_combo.itemText(index)
+            for method, container in self.hyperparameter_containers.items():
+                container.setVisible(method == selected_method)
         except Exception as e:
             print(f"An error occurred while changing training method: {e}")
                         
@@ -954,82 +1245,76 @@ class Platform(QWidget):
                                         
     def function_update_downloaded_datasets_table(self, dataset=None) -> None:
         """
-        Updates the list of downloaded datasets.
-        """
-        try:       
-            # Initialize empty sets for existing items
-            existing_items_train = set()
-            existing_items_validation = set()
-            existing_items_features = set()
-            existing_items_downloaded = set()
-            existing_meta_model_downloaded = set()
-
-            # Check if each list widget is defined before attempting to collect existing items
-            widgets = {
-                'list_widget_train_downloaded_datasets': existing_items_train,
-                'list_widget_validation_downloaded_datasets': existing_items_validation,
-                'list_Widget_Features_Downloaded_Datasets': existing_items_features,
-                'list_Widget_Availabile_Downloaded_Datasets': existing_items_downloaded,
-                'list_Widget_meta_model_datasets': existing_meta_model_downloaded
-            }
-
-            for widget_name, item_set in widgets.items():
-                if hasattr(self, widget_name):
-                    item_set.update(
-                        self.helper_function_find_widget_items(getattr(self, widget_name))
-                    )
-                else:
-                    print(f"Warning: {widget_name} is not defined.")
-                    return
-
-        except AttributeError as e:
-            print(f"Error accessing widgets: {e}")
+        Refreshes the dataset folder manifest after a download and applies the changes
+        to the downloaded datasets lists.
+        """
+        if self.dataset_manifest is None:
             return
-        
-        # Update list widgets with new items
-        for item in existing_items_downloaded:
-            item_lower = item.lower()
-            if "feature" in item_lower and item not in existing_items_features:
-                self.list_Widget_Features_Downloaded_Datasets.addItem(item)
 
-            if "validation" in item_lower and item not in existing_items_validation:
-                self.list_widget_validation_downloaded_datasets.addItem(item)
+        directories = None
+        if dataset is not None:
+            dataset_path = os.path.join(self.dataset_manifest.folder_path, dataset.text())
+            directories = [os.path.dirname(dataset_path)]
+        self.function_refresh_dataset_manifest(directories)
 
-            if "train" in item_lower and item not in existing_items_train:
-                self.list_widget_train_downloaded_datasets.addItem(item)
+    def function_dataset_folder_changed(self, directory_path) -> None:
+        """
+        Called by the file system watcher when a watched directory changes.
+        """
+        self.function_refresh_dataset_manifest([directory_path])
 
-            if "meta_model" in item_lower and item not in existing_meta_model_downloaded:
-                self.list_Widget_meta_model_datasets.addItem(item)
+    def function_refresh_dataset_manifest(self, directories=None) -> None:
+        """
+        Rescans the given directories (or every directory whose modification time changed)
+        and sends only the added and removed files to the list widgets.
+        """
+        try:
+            added, removed = self.dataset_manifest.refresh(directories)
+            self.function_apply_dataset_manifest_diff(added, removed)
+            self.function_watch_dataset_folders()
+        except Exception as e:
+            print(f"Error refreshing downloaded datasets list: {e}")
 
-        # Handle newly selected dataset
-        if dataset is not None:
-            dataset_text = dataset.text()
-            dataset_lower = dataset_text.lower()
+    def function_apply_dataset_manifest_diff(self, added, removed) -> None:
+        """
+        Adds and removes manifest entries from the downloaded datasets list and the role lists.
+        """
+        role_widgets = {
+            "feature": self.list_Widget_Features_Downloaded_Datasets,
+            "validation": self.list_widget_validation_downloaded_datasets,
+            "train": self.list_widget_train_downloaded_datasets,
+            "meta_model": self.list_Widget_meta_model_datasets
+        }
 
-            if dataset_text not in existing_items_downloaded:
-                self.list_Widget_Availabile_Downloaded_Datasets.addItem(dataset_text)
+        for relative_path, roles in removed:
+            for widget in [self.list_Widget_Availabile_Downloaded_Datasets] + [role_widgets[role] for role in roles]:
+                for item in widget.findItems(relative_path, Qt.MatchExactly):
+                    widget.takeItem(widget.row(item))
 
-            if "feature" in dataset_lower and dataset_text not in existing_items_features:
-                self.list_Widget_Features_Downloaded_Datasets.addItem(dataset_text)
-                    
-            if "validation" in dataset_lower and dataset_text not in existing_items_validation:
-                self.list_widget_validation_downloaded_datasets.addItem(dataset_text)
-                    
-            if "train" in dataset_lower and dataset_text not in existing_items_train:
-                self.list_widget_train_downloaded_datasets.addItem(dataset_text)
+        for relative_path, roles in added:
+            for widget in [self.list_Widget_Availabile_Downloaded_Datasets] + [role_widgets[role] for role in roles]:
+                widget.addItem(relative_path)
 
-            if "meta_model" in dataset_lower and dataset_text not in existing_meta_model_downloaded:
-                self.list_Widget_meta_model_datasets.addItem(dataset_text)
+        if added or removed:
+            print(f"Downloaded datasets updated: {len(added)} added, {len(removed)} removed")
 
-    def helper_function_find_widget_items(self, widget):
+    def function_watch_dataset_folders(self) -> None:
         """
-        Helper function to get the text of all items in a list widget.
+        Keeps the file system watcher on exactly the directories listed in the manifest.
         """
-        return {widget.item(i).text() for i in range(widget.count())}
-                
+        watched = set(self.dataset_folder_watcher.directories())
+        wanted = set(self.dataset_manifest.directory_paths())
+        if watched - wanted:
+            self.dataset_folder_watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self.dataset_folder_watcher.addPaths(list(wanted - watched))
+
     def function_update_downloaded_datasets_list(self, folder_path) -> None:
         """
-        Updates the list of downloaded datasets.
+        Updates the list of downloaded datasets for a new dataset folder.
+
+        The folder manifest is loaded from disk and only directories modified since it
+        was saved are rescanned. Later changes arrive through the file system watcher.
         """
         # Clear the lists if they exist
         for widget_name in [
@@ -1047,16 +1332,10 @@ class Platform(QWidget):
         self.function_handle_feature_list_change(None)
 
         try:
-            # Iterate over the directory and files
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    if file.endswith(('.csv', '.parquet', '.json', '.xlsx', '.db', '.sqlite', '.sqlite3')):
-                        file_path = os.path.join(root, file)
-                        relative_path = os.path.relpath(file_path, folder_path).replace('\\', '/')
-                        self.list_Widget_Availabile_Downloaded_Datasets.addItem(relative_path)
-            
-            # Update the downloaded datasets table
-            self.function_update_downloaded_datasets_table()
+            self.dataset_manifest = DatasetFolderManifest(folder_path)
+            self.dataset_manifest.refresh()
+            self.function_apply_dataset_manifest_diff(self.dataset_manifest.items(), [])
+            self.function_watch_dataset_folders()
         
         except Exception as e:
             print(f"Error updating downloaded datasets list: {e}")
@@ -1116,27 +1395,19 @@ class Platform(QWidget):
     
         try:
             if file_extension == ".json":
-                with open(full_file_path, 'r') as file:
-                    feature_metadata = json.load(file)
+                feature_set_sizes = self.feature_metadata.feature_set_sizes(full_file_path)
 
                 # Clear existing contents of the list widget
                 self.list_widget_features_content.clear()
 
-                # Get feature sets data
-                feature_sets_data = feature_metadata.get('feature_sets', {})
-
                 # Populate list widget with feature sets keys
-                if not feature_sets_data:
+                if not feature_set_sizes:
                     QMessageBox.information(self, "Info", "No feature sets found in the file.")
                 else:
-                    for key in feature_sets_data.keys():
+                    for key, size in feature_set_sizes.items():
                         item = QListWidgetItem(str(key))
+                        item.setToolTip(f"{size} features")
                         self.list_widget_features_content.addItem(item)
-
-                # Populate list widget with feature sets keys
-                for key in feature_sets_data.keys():
-                    item = QListWidgetItem(str(key))
-                    self.list_widget_features_content.addItem(item)
             else:
                 raise ValueError("Unsupported file format. Only JSON files are supported.")
 
@@ -1187,19 +1458,33 @@ class Platform(QWidget):
              
     def function_Multiple_Train_Buttons(self) -> None: 
         """
-        Trains multiple models based on selected hyperparameters and feature sets,
-        and displays the results in a table widget.
+        Trains multiple models based on selected hyperparameters and feature sets.
+
+        The inputs are checked here, then loading, training and scoring run on a SweepWorker
+        in a background thread so the window stays responsive. Each scored model is added to
+        the results table as soon as it is ready, and the sweep can be stopped with Cancel.
         """
+        if self.sweep_thread is not None:
+            QMessageBox.warning(self, "Training Running", "A sweep is already running. Cancel it or wait for it to finish.")
+            return
+
         # Retrieve selected feature sets
         selected_feature_sets = self.get_selected_feature_sets()
         if selected_feature_sets is None:
             QMessageBox.warning(self, "Selection Error", "No feature sets selected.")
             return
         
-        # Load training data
-        train = self.load_training_data(selected_feature_sets)
-        if train is None:
-            QMessageBox.warning(self, "Data Error", "Failed to load training data.")
+        # Read the era subsampling options for the training data
+        era_stride = self.get_era_stride()
+        training_era_window = self.get_era_window(self.training_era_start, self.training_era_end)
+        validation_era_window = self.get_era_window(self.validation_era_start, self.validation_era_end)
+        if era_stride is None or training_era_window is None or validation_era_window is None:
+            return
+
+        # Get the currently selected training file
+        selected_training_file_item = self.list_widget_train_downloaded_datasets.currentItem()
+        if not selected_training_file_item:
+            QMessageBox.warning(self, "Selection Required", "Please select a training file to proceed.")
             return
         
         # Load performance metric file
@@ -1215,170 +1500,254 @@ class Platform(QWidget):
 
         # Verify modelling method algorithm selected by user 
         selected_method = self.training_method_combo.currentText()
-        if selected_method == "LGBMRegressor":
-            hyperparameters_grid = self.create_lgbm_hyperparameter_grid()
-        elif selected_method == "HistGradientBoostingRegressor":
-            hyperparameters_grid = self.create_HistGradientBoostingRegressor_hyperparameter_grid()
+        if selected_method in ESTIMATOR_BACKENDS:
+            hyperparameters_grid = self.create_hyperparameter_grid(ESTIMATOR_BACKENDS[selected_method])
         else:
             QMessageBox.warning(self, "Invalid Input", "Please select a valid training method.")
             return
         
-        # Dictionary to store trained models for the current round
-        trained_models_table_this_round_only = {} 
-        
+        prediction_batch_size = self.get_optional_positive_integer(self.prediction_batch_size, "Prediction batch size", PREDICTION_BATCH_SIZE)
+        parallel_processes = self.get_optional_positive_integer(self.parallel_processes, "Parallel training processes", 1)
+        if prediction_batch_size is None or parallel_processes is None:
+            return
+
+        early_stopping_rounds = self.get_optional_positive_integer(self.early_stopping_rounds, "Early stopping rounds", None)
+        early_stopping_eras = self.get_optional_positive_integer(self.early_stopping_eras, "Early stopping holdout eras", EARLY_STOPPING_HOLDOUT_ERAS)
+        if early_stopping_eras is None or (early_stopping_rounds is None and self.early_stopping_rounds.text().strip()):
+            return
+
+        if not hyperparameters_grid:  # Check if hyperparameters_grid is not None or empty
+            return
+
+        search_strategy = self.search_strategy_combo.currentText()
+        search_budget = self.get_optional_positive_integer(self.search_budget, "Search budget", None)
+        halving_factor = self.get_optional_positive_integer(self.halving_factor, "Halving factor", HALVING_FACTOR)
+        if halving_factor is None or (search_budget is None and self.search_budget.text().strip()):
+            return
+        if halving_factor < 2:
+            QMessageBox.warning(self, "Input Error", "Halving factor must be at least 2.")
+            return
+
         try:
-            if hyperparameters_grid:  # Check if hyperparameters_grid is not None or empty
-                for i in range(len(next(iter(hyperparameters_grid.values())))):
-                    try:  
-                        hyperparameters_dict = {key: hyperparameters_grid[key][i] for key in hyperparameters_grid}
+            hyperparameter_rows = expand_hyperparameter_grid(hyperparameters_grid, search_strategy, search_budget)
+        except Exception as e:
+            QMessageBox.warning(self, "Input Error", f"Cells not balanced in numbers {hyperparameters_grid}: {e}")
+            return
+        print(f"{search_strategy}: {len(hyperparameter_rows)} hyperparameter configurations")
+
+        # Everything the worker needs is read from the widgets now, the worker never touches them
+        sweep_settings = {
+            "dataset_folder": self.dynamic_folder_path,
+            "feature_set_name": self.selected_feature_set,
+            "selected_feature_sets": selected_feature_sets,
+            "training_file": selected_training_file_item.text(),
+            "validation_file": validation_file_path,
+            "meta_model_file": Performance_validation_file_path,
+            "era_stride": era_stride,
+            "training_era_window": training_era_window,
+            "validation_era_window": validation_era_window,
+            "compact_dtypes": self.compact_dtypes_checkbox.isChecked(),
+            "save_lightgbm_binary": self.save_lightgbm_binary_checkbox.isChecked(),
+            "prediction_batch_size": prediction_batch_size,
+            "parallel_processes": parallel_processes,
+            "early_stopping_rounds": early_stopping_rounds,
+            "early_stopping_eras": early_stopping_eras,
+            "selected_method": selected_method,
+            "hyperparameter_rows": hyperparameter_rows,
+            "search_strategy": search_strategy,
+            "halving_factor": halving_factor,
+        }
+        self.function_start_sweep(sweep_settings)
 
-                        model = self.train_lgb_model_with_hyperparameters(hyperparameters_dict, selected_feature_sets, train)
-                    except Exception as e:
-                        print(f"Error training model with hyperparameters {hyperparameters_dict}: {e}")
-                        continue    
-                        
-                    try:                    
-                        # Load validation data
-                        validation = self.load_validation_data(selected_feature_sets,validation_file_path)
-                        if validation is None:
-                            return
-
-                        validation = validation[validation["data_type"] == "validation"]
-                        del validation["data_type"]
-
-                        # Eras are 1 week apart, but targets look 20 days (or 4 weeks/eras) into the future,
-                        # so we need to "embargo" the first 4 eras following our last train era to avoid "data leakage"
-                        last_train_era = int(train["era"].unique()[-1])
-                        eras_to_embargo = [str(era).zfill(4) for era in [last_train_era + i for i in range(4)]]
-                        validation = validation[~validation["era"].isin(eras_to_embargo)]
-                        
-                        self.fuction_parquet_data_into_table(validation,self.table_widget_validation_dataset)
+    def function_start_sweep(self, sweep_settings) -> None:
+        """
+        Starts a SweepWorker on its own QThread and connects its signals to the window.
+        """
+        self.sweep_thread = QThread(self)
+        self.sweep_worker = SweepWorker(sweep_settings, self.lightgbm_dataset_cache)
+        self.sweep_worker.moveToThread(self.sweep_thread)
+
+        self.sweep_thread.started.connect(self.sweep_worker.run)
+        self.sweep_worker.progress.connect(self.function_sweep_progress)
+        self.sweep_worker.table_ready.connect(self.function_show_sweep_table)
+        self.sweep_worker.model_ready.connect(self.function_add_sweep_result)
+        self.sweep_worker.failed.connect(self.function_sweep_failed)
+        self.sweep_worker.finished.connect(self.sweep_thread.quit)
+        self.sweep_thread.finished.connect(self.function_sweep_finished)
+
+        self.button_train_multi_models.setEnabled(False)
+        self.button_cancel_sweep.setEnabled(True)
+        self.sweep_progress_bar.setRange(0, len(sweep_settings["hyperparameter_rows"]))
+        self.sweep_progress_bar.setValue(0)
+        self.sweep_thread.start()
+
+    def function_cancel_sweep(self) -> None:
+        """
+        Asks the running sweep to stop. LightGBM stops at its next boosting iteration and no
+        further models are started; models already added to the results table are kept.
+        """
+        if self.sweep_worker is not None:
+            self.sweep_status_label.setText("Cancelling...")
+            self.button_cancel_sweep.setEnabled(False)
+            self.sweep_worker.cancel()
 
-                        # Generate predictions against the out-of-sample validation features
-                        # This will take a few minutes
-                        validation["prediction"] = model.predict(validation[selected_feature_sets])
-                        print(validation[["era", "prediction", "target"]])
-                    
-                    except Exception as e:
-                        print(f"Error during validation or prediction: {e}")
-                        continue
-            
-                    try:
-                        # Load performance metric file
-                        Performance_validation = self.load_performance_metric_file(validation,Performance_validation_file_path)
-                        if Performance_validation is None:
-                            return
-                        
-                        # Compute the per-era corr between our predictions and the target values
-                        per_era_corr = Performance_validation.groupby("era").apply(
-                            lambda x: numerai_corr(x[["prediction"]].dropna(), x["target"].dropna())
-                        )
+    def function_sweep_progress(self, stage, completed, total) -> None:
+        self.sweep_status_label.setText(stage)
+        self.sweep_progress_bar.setRange(0, max(total, 1))
+        self.sweep_progress_bar.setValue(completed)
 
-                        per_era_mmc = Performance_validation.dropna().groupby("era").apply(
-                            lambda x: correlation_contribution(x[["prediction"]], x["meta_model"], x["target"])
-                        )
-                        
-                    except Exception as e:
-                        print(f"Error computing performance metrics: {e}")
-                        continue
-                    
-                    try:
-                        # Compute performance metrics
-                        corr_mean = per_era_corr.mean()
-                        corr_std = per_era_corr.std(ddof=0)
-                        corr_sharpe = corr_mean / corr_std
-                        corr_max_drawdown = (per_era_corr.cumsum().expanding(min_periods=1).max() - per_era_corr.cumsum()).max()
-
-                        mmc_mean = per_era_mmc.mean()
-                        mmc_std = per_era_mmc.std(ddof=0)
-                        mmc_sharpe = mmc_mean / mmc_std
-                        mmc_max_drawdown = (per_era_mmc.cumsum().expanding(min_periods=1).max() - per_era_mmc.cumsum()).max()
-
-                        # Create a DataFrame to hold the results
-                        results_df = pd.DataFrame({
-                            'n_estimators': [hyperparameters_dict.get('n_estimators')],
-                            'learning_rate': [hyperparameters_dict.get('learning_rate')],
-                            'max_depth': [hyperparameters_dict.get('max_depth')],
-                            'num_leaves': [hyperparameters_dict.get('num_leaves')],
-                            'colsample_bytree': [hyperparameters_dict.get('colsample_bytree')],
-                            'max_iter': [hyperparameters_dict.get('max_iter')],
-                            'max_leaf_nodes': [hyperparameters_dict.get('max_leaf_nodes')],
-                            'max_features': [hyperparameters_dict.get('max_features')],
-                            "corr_mean": [corr_mean],
-                            "mmc_mean": [mmc_mean],
-                            "corr_std": [corr_std],
-                            "mmc_std": [mmc_std],
-                            "corr_sharpe": [corr_sharpe],
-                            "mmc_sharpe": [mmc_sharpe],
-                            "corr_max_drawdown": [corr_max_drawdown],
-                            "mmc_max_drawdown": [mmc_max_drawdown]
-                        })
-
-                        if model is not None:
-                            # Determine the next number for self.trained_models
-                            # If self.trained_models is empty, max(..., default=-1) returns -1, so next_number becomes 0
-                            next_number = max(self.trained_models.keys(), default=-1) + 1
-                            
-                            # Determine the next number for trained_models_table_this_round_only
-                            # If trained_models_table_this_round_only is empty, max(..., default=-1) returns -1, so next_number_this_round becomes 0
-                            next_number_this_round = max(trained_models_table_this_round_only.keys(), default=-1) + 1
-                            
-                            # Store the hyperparameters dictionary and model
-                            model_data = (results_df, model, validation, Performance_validation, per_era_corr, per_era_mmc)
-                            self.trained_models[next_number] = model_data
-                            trained_models_table_this_round_only[next_number_this_round] = model_data
+    def function_show_sweep_table(self, frame, table_name) -> None:
+        self.fuction_parquet_data_into_table(frame, getattr(self, table_name))
 
-                    except Exception as e:
-                        print(f"Error storing model data: {e}")
-                        continue
+    def function_sweep_failed(self, title, message) -> None:
+        QMessageBox.warning(self, title, message)
 
-                # Get the current row count to start adding new rows
-                current_row_count = self.table_widget_multi_results.rowCount()
+    def function_add_sweep_result(self, model_result) -> None:
+        """
+        Stores a scored model and appends its row to the results table.
 
-                # Set the column count and headers if not already set
-                if self.table_widget_multi_results.columnCount() == 0:
-                    headers = list(results_df.columns) + ['']
-                    self.table_widget_multi_results.setColumnCount(len(headers))
-                    self.table_widget_multi_results.setHorizontalHeaderLabels(headers)
-                else:
-                    headers = [self.table_widget_multi_results.horizontalHeaderItem(i).text() for i in range(self.table_widget_multi_results.columnCount())]
-
-                # Iterate over trained models dictionary with an index starting from the current row count
-                for row_num, (index, (results_df, model, validation, Performance_validation,_,_)) in enumerate(trained_models_table_this_round_only.items(), start=current_row_count):
-                    self.table_widget_multi_results.insertRow(row_num)
-                    for j, value in enumerate(results_df.values.tolist()[0]):
-                        if results_df.columns[j] in ["corr_mean", "mmc_mean", "corr_std", "mmc_std", "corr_sharpe", "mmc_sharpe", "corr_max_drawdown", "mmc_max_drawdown"]:
-                            # Extract the float number using regular expressions
-                            match = re.search(r"[-+]?\d*\.\d+|\d+", str(value))
-                            if match:
-                                float_value = float(match.group())
-                                item = QTableWidgetItem(f'{float_value:.6f}')
-                                self.table_widget_multi_results.setItem(row_num, j, item)
-                            else:
-                                # Handle cases where no float number is found
-                                item = QTableWidgetItem()
-                                self.table_widget_multi_results.setItem(row_num, j, item)
-                        else:
-                            item = QTableWidgetItem(str(value))
-                            self.table_widget_multi_results.setItem(row_num, j, item)
-     
-                    button = QPushButton("Download Model")
-                    button.clicked.connect(lambda checked, model=model, selected_feature_sets=selected_feature_sets: self.function_download_Live_predictions_for_a_row(model, selected_feature_sets))
-                    self.table_widget_multi_results.setCellWidget(row_num, len(headers) - 1, button)
-                    
-                self.body_widget.setCurrentIndex(2)
-            
+        Args:
+            model_result (ModelResult): Result record of the scored sweep row.
+        """
+        # If self.trained_models is empty, max(..., default=-1) returns -1, so next_number becomes 0
+        next_number = max(self.trained_models.keys(), default=-1) + 1
+        try:
+            model_result.move_to_model_pool(self.model_pool, next_number)
+        except Exception as e:
+            # The model then stays in memory only
+            print(f"Model pool: could not write model {next_number} to disk: {e}")
+        self.trained_models[next_number] = model_result
+        self.function_append_multi_results_row(model_result)
+
+    def function_rescore_trained_models(self) -> None:
+        """
+        Re-scores every trained model against the selected meta model file and rebuilds the
+        results table.
+
+        The models of one sweep share their ScoringContext, so each context gets the new
+        meta model once and the predictions of its models are scored as one matrix by
+        ScoringContext.score.
+        """
+        if not self.trained_models:
+            QMessageBox.warning(self, "No Models", "Train models before re-scoring them.")
+            return
+        if self.sweep_thread is not None:
+            QMessageBox.warning(self, "Training Running", "Wait for the sweep to finish before re-scoring its models.")
+            return
+        selected_item = self.list_Widget_meta_model_datasets.currentItem()
+        if selected_item is None:
+            QMessageBox.warning(self, "Selection Required", "Please select a Performance file to proceed.")
+            return
+
+        full_file_path = os.path.join(self.dynamic_folder_path, selected_item.text())
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            meta_model = pd.read_parquet(full_file_path, columns=["numerai_meta_model"])["numerai_meta_model"]
+
+            # Group the models by the validation rows they share
+            groups = {}
+            for number, model_result in self.trained_models.items():
+                groups.setdefault(id(model_result.scoring_context), []).append(number)
+
+            for numbers in groups.values():
+                scoring_context = self.trained_models[numbers[0]].scoring_context
+                scoring_context.set_meta_model(meta_model.reindex(scoring_context.index).to_numpy())
+                predictions = pd.DataFrame({number: self.trained_models[number].predictions for number in numbers})
+                per_era_corr, per_era_mmc, summary = scoring_context.score(predictions)
+                for number in numbers:
+                    self.trained_models[number].set_scores(per_era_corr[number], per_era_mmc[number], summary.loc[number])
+                print(f"Re-scored {len(numbers)} models on {len(scoring_context.index)} validation rows")
+        except KeyError:
+            QMessageBox.warning(self, "Error", "Expected column 'numerai_meta_model' not found in the file.")
+            return
         except Exception as e:
-            QMessageBox.warning(self, f"Cells not balanced in numbers {hyperparameters_grid}: {e}")
-            raise RuntimeError("Results not generated due to entry error")
+            QMessageBox.warning(self, "Error", f"Error re-scoring the models: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.function_rebuild_multi_results_table()
+
+    def function_rebuild_multi_results_table(self) -> None:
+        """
+        Rebuilds the results table from self.trained_models in model number order.
+        """
+        self.table_widget_multi_results.setRowCount(0)
+        self.table_widget_multi_results.setColumnCount(0)
+        for number in sorted(self.trained_models):
+            model_result = self.trained_models[number]
+            self.function_append_multi_results_row(model_result)
+        self.function_update_graphs()
+
+    def function_sweep_finished(self) -> None:
+        if self.sweep_worker.cancel_event.is_set():
+            self.sweep_status_label.setText("Sweep cancelled")
+        self.sweep_worker.deleteLater()
+        self.sweep_thread.deleteLater()
+        self.sweep_worker = None
+        self.sweep_thread = None
+
+        self.button_train_multi_models.setEnabled(True)
+        self.button_cancel_sweep.setEnabled(False)
+        self.function_refresh_experiments(page=0)
+        if self.model_pool.files:
+            print(f"Model pool: {self.model_pool.counts()}")
+        if self.table_widget_multi_results.rowCount():
+            self.body_widget.setCurrentIndex(2)
+
+    def function_append_multi_results_row(self, model_result) -> None:
+        """
+        Appends one trained model to the results table with a button to download it. The
+        model is only fetched from the model pool when the button is clicked.
+        """
+        results_df = model_result.results_df
+        # Set the column count and headers if not already set
+        if self.table_widget_multi_results.columnCount() == 0:
+            headers = list(results_df.columns) + ['']
+            self.table_widget_multi_results.setColumnCount(len(headers))
+            self.table_widget_multi_results.setHorizontalHeaderLabels(headers)
+        else:
+            headers = [self.table_widget_multi_results.horizontalHeaderItem(i).text() for i in range(self.table_widget_multi_results.columnCount())]
+
+        row_num = self.table_widget_multi_results.rowCount()
+        self.table_widget_multi_results.insertRow(row_num)
+        for j, value in enumerate(results_df.values.tolist()[0]):
+            if results_df.columns[j] in RESULT_SCORE_COLUMNS and isinstance(value, (int, float)):
+                item = QTableWidgetItem(f'{value:.6f}')
+                self.table_widget_multi_results.setItem(row_num, j, item)
+            elif results_df.columns[j] in RESULT_SCORE_COLUMNS:
+                # Extract the float number using regular expressions
+                match = re.search(r"[-+]?\d*\.\d+|\d+", str(value))
+                if match:
+                    float_value = float(match.group())
+                    item = QTableWidgetItem(f'{float_value:.6f}')
+                    self.table_widget_multi_results.setItem(row_num, j, item)
+                else:
+                    # Handle cases where no float number is found
+                    item = QTableWidgetItem()
+                    self.table_widget_multi_results.setItem(row_num, j, item)
+            else:
+                item = QTableWidgetItem(str(value))
+                self.table_widget_multi_results.setItem(row_num, j, item)
+
+        button = QPushButton("Download Model")
+        button.clicked.connect(lambda checked, model_result=model_result: self.function_download_Live_predictions_for_a_row(model_result.model, model_result.selected_feature_sets))
+        self.table_widget_multi_results.setCellWidget(row_num, len(headers) - 1, button)
+
+    def closeEvent(self, event):
+        # Stop a running sweep before its thread is destroyed with the window
+        if self.sweep_thread is not None:
+            self.sweep_worker.cancel()
+            self.sweep_thread.quit()
+            self.sweep_thread.wait()
+        self.model_pool.close()
+        super().closeEvent(event)
             
     def function_download_Live_predictions_for_a_row(self, model ,selected_feature_sets):
         if model is None or selected_feature_sets is None:
             QMessageBox.warning(None, "Error", "Please train the model first.")
             return None
 
-        model_with_predict = ModelWithPredictMethod(model, selected_feature_sets)
-
         # Construct the file path using self.dynamic_folder_path with a timestamp
         if self.dynamic_folder_path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1388,6 +1757,15 @@ class Platform(QWidget):
             QMessageBox.warning(None, "Error", "Dynamic folder path is not set.")
             return None
 
+        if self.lean_export_checkbox.isChecked() and isinstance(model, lgb.Booster):
+            try:
+                written = export_native_lightgbm_model(model, selected_feature_sets, file_path)
+                QMessageBox.information(None, "Success", "Lean model exported to " + ", ".join(written) + ".")
+            except Exception as e:
+                QMessageBox.warning(None, "Error", f"Error exporting model: {e}")
+            return None
+
+        model_with_predict = ModelWithPredictMethod(model, selected_feature_sets)
         try:
             # Pickle the entire ModelWithPredictMethod class
             model_pickle = cloudpickle.dumps(model_with_predict.predict)
@@ -1427,27 +1805,6 @@ class Platform(QWidget):
             self.table_widget_validation_results.setItem(row_num, 2, QTableWidgetItem(str(row["prediction"])))
             self.table_widget_validation_results.setItem(row_num, 3, QTableWidgetItem(str(row["target"])))
                                                                                           
-    def train_lgb_model_with_hyperparameters(self, hyperparameters, selected_feature_sets, train):
-        """
-        Train a model with specified hyperparameters.
-
-        Args:
-            hyperparameters (dict): Dictionary containing hyperparameter values.
-            selected_feature_sets (list): List of selected feature sets.
-            train (pd.DataFrame): Training data.
-
-        Returns:
-            sklearn.base.BaseEstimator: Trained model.
-        """
-        try:
-            # Train the model using the provided features and target data
-            model = LGBMRegressor(**hyperparameters)
-            model.fit(train[selected_feature_sets], train["target"])
-            return model
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error training model: {e}")
-            return None
-    
     def verify_load_validation_file_selected(self):
         """
         Loads validation data.
@@ -1461,37 +1818,49 @@ class Platform(QWidget):
             QMessageBox.warning(self, "Selection Required", "Please select a validation file to proceed.")
         return selected_validation_file
     
-    def load_validation_data(self, selected_feature_sets,selected_validation_file):
+    def get_era_stride(self):
         """
-        Loads validation data.
+        Reads the training era stride from the Train page.
 
         Returns:
-            str or None: File path of the selected validation file if successful, None otherwise.
+            int or None: The era stride, 1 when left empty, or None if the input is invalid.
         """
-        file_extension = os.path.splitext(selected_validation_file)[1].lower()
-        full_file_path = os.path.join(self.dynamic_folder_path, selected_validation_file)
+        return self.get_optional_positive_integer(self.training_era_stride, "Era stride", 1)
 
-        try:
-            if file_extension == ".parquet":
-                # Ensure selected_feature_sets is a list of column names
-                if not isinstance(selected_feature_sets, list):
-                    raise ValueError("selected_feature_sets should be a list of column names.")
+    def get_optional_positive_integer(self, lineedit, name, default):
+        """
+        Reads an optional positive Integer from a line edit.
 
-                # Attempt to read the parquet file
-                validation = pd.read_parquet(full_file_path, columns=["era", "data_type", "target"] + selected_feature_sets)
-                return validation
+        Returns:
+            int or None: The value, default when left empty, or None if the input is invalid.
+        """
+        text = lineedit.text().strip()
+        if not text:
+            return default
+        if not text.isdigit() or int(text) < 1:
+            QMessageBox.warning(self, "Input Error", f"{name} must be a positive Integer, got '{text}'.")
+            return None
+        return int(text)
+
+    def get_era_window(self, era_start_lineedit, era_end_lineedit):
+        """
+        Reads an optional era window from a pair of line edits.
+
+        Returns:
+            tuple or None: (era_start, era_end) as zero padded era strings, each None when left
+            empty, or None if the input is not a valid era number.
+        """
+        era_window = []
+        for lineedit in (era_start_lineedit, era_end_lineedit):
+            text = lineedit.text().strip()
+            if not text:
+                era_window.append(None)
+            elif text.isdigit():
+                era_window.append(text.zfill(4))
             else:
-                raise ValueError("Unsupported file format.")
-        except FileNotFoundError:
-            QMessageBox.warning(self, "Error", f"File not found: {full_file_path}")
-        except pd.errors.EmptyDataError:
-            QMessageBox.warning(self, "Error", "No data found in the file.")
-        except ValueError as ve:
-            QMessageBox.warning(self, "Error", f"ValueError: {ve}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error loading dataset: {e}")
-        
-        return None
+                QMessageBox.warning(self, "Input Error", f"Era window values must be era numbers like 0575, got '{text}'.")
+                return None
+        return tuple(era_window)
 
     def verify_load_performance_metric_file_selected(self):
         """
@@ -1508,161 +1877,76 @@ class Platform(QWidget):
         
         return selected_performance_file
 
-    def load_performance_metric_file(self,validation,selected_performance_file):
+    def get_selected_feature_sets(self):
+        """
+        Retrieves the selected feature sets from the feature file.
+
+        Returns:
+            list or None: Selected feature sets if successful, None otherwise.
+        """
+        if not self.selected_feature_set or not self.selected_feature_file:
+            QMessageBox.warning(self, "Selection Required", "Please select a Feature Set and a Feature File to proceed.")
+            return None
+
+        file_extension = os.path.splitext(self.selected_feature_file)[1].lower()
+        full_file_path = os.path.join(self.dynamic_folder_path, self.selected_feature_file)
 
-        file_extension = os.path.splitext(selected_performance_file)[1].lower()
-        full_file_path = os.path.join(self.dynamic_folder_path, selected_performance_file)
         try:
-            if file_extension == ".parquet":
-                # Read the meta_model column from the parquet file
-                meta_model_data = pd.read_parquet(full_file_path)["numerai_meta_model"]
-                
-                # Ensure that the 'meta_model' column is not already present
-                if 'meta_model' in validation.columns:
-                    QMessageBox.warning(self, "Warning", "Meta model column already exists in the validation data.")
-                    return None
-                
-                # Add the meta_model column to the validation DataFrame
-                validation["meta_model"] = meta_model_data
-                
-                # Update the table with performance metrics
-                self.fuction_parquet_data_into_table(validation, self.table_widget_metamodel_performance_file)
-                return validation
+            if file_extension == ".json":
+                selected_feature_sets = self.feature_metadata.feature_set(full_file_path, self.selected_feature_set)
+                if selected_feature_sets is None:
+                    QMessageBox.warning(self, "Error", f"Feature set '{self.selected_feature_set}' not found in the file.")
+                return selected_feature_sets
             else:
-                raise ValueError("Unsupported file format.")
-            
+                raise ValueError("Unsupported file format. Only .json files are supported.")
         except FileNotFoundError:
             QMessageBox.warning(self, "Error", f"File not found: {full_file_path}")
-        except pd.errors.EmptyDataError:
-            QMessageBox.warning(self, "Error", "No data found in the file.")
+        except json.JSONDecodeError:
+            QMessageBox.warning(self, "Error", "Error decoding JSON file.")
         except ValueError as ve:
             QMessageBox.warning(self, "Error", f"ValueError: {ve}")
-        except KeyError:
-            QMessageBox.warning(self, "Error", "Expected column 'numerai_meta_model' not found in the file.")
         except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error loading performance metric file: {e}")
-        
+            QMessageBox.warning(self, "Error", f"Error loading dataset: {e}")
+
         return None
-                  
-    def load_training_data(self, selected_feature_sets):
+         
+    def create_hyperparameter_grid(self, backend):
         """
-        Loads training data based on the selected feature sets.
-
-        Args:
-            selected_feature_sets (list): Selected feature sets.
+        Creates a hyperparameter grid for a training method based on user input, with the
+        hyperparameters declared by its backend.
 
         Returns:
-            pd.DataFrame or None: Loaded training data if successful, None otherwise.
+            dict or None: Hyperparameter grid if successful, None otherwise.
         """
-        # Get the currently selected training file
-        selected_training_file_item = self.list_widget_train_downloaded_datasets.currentItem()
-        if not selected_training_file_item:
-            QMessageBox.warning(self, "Selection Required", "Please select a training file to proceed.")
-            return None
-        
-        selected_training_file = selected_training_file_item.text()
-        file_extension = os.path.splitext(selected_training_file)[1].lower()
-        full_file_path = os.path.join(self.dynamic_folder_path, selected_training_file)
-
-        try:
-            if file_extension == ".parquet":
-                # Load the training data from the parquet file
-                train = pd.read_parquet(full_file_path, columns=["era", "target"] + selected_feature_sets)
-                self.fuction_parquet_data_into_table(train, self.table_widget_train_dataset)
-                logging.debug('Loaded training data successfully')
-                return train
-            else:
-                raise ValueError("Unsupported file format. Only .parquet files are supported.")
-        except FileNotFoundError:
-            QMessageBox.warning(self, "Error", f"File not found: {full_file_path}")
-        except pd.errors.EmptyDataError:
-            QMessageBox.warning(self, "Error", "No data found in the file.")
-        except ValueError as ve:
-            QMessageBox.warning(self, "Error", f"ValueError: {ve}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error loading dataset: {e}")
-
-        return None
-                  
-    def get_selected_feature_sets(self):
-        """
-        Retrieves the selected feature sets from the feature file.
-
-        Returns:
-            list or None: Selected feature sets if successful, None otherwise.
-        """
-        if not self.selected_feature_set or not self.selected_feature_file:
-            QMessageBox.warning(self, "Selection Required", "Please select a Feature Set and a Feature File to proceed.")
-            return None
-
-        file_extension = os.path.splitext(self.selected_feature_file)[1].lower()
-        full_file_path = os.path.join(self.dynamic_folder_path, self.selected_feature_file)
-
-        try:
-            if file_extension == ".json":
-                with open(full_file_path, 'r') as file:
-                    feature_metadata = json.load(file)
-                    selected_feature_sets = feature_metadata["feature_sets"].get(self.selected_feature_set, None)
-                    if selected_feature_sets is None:
-                        QMessageBox.warning(self, "Error", f"Feature set '{self.selected_feature_set}' not found in the file.")
-                    return selected_feature_sets
-            else:
-                raise ValueError("Unsupported file format. Only .json files are supported.")
-        except FileNotFoundError:
-            QMessageBox.warning(self, "Error", f"File not found: {full_file_path}")
-        except json.JSONDecodeError:
-            QMessageBox.warning(self, "Error", "Error decoding JSON file.")
-        except ValueError as ve:
-            QMessageBox.warning(self, "Error", f"ValueError: {ve}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error loading dataset: {e}")
-
-        return None
-         
-    def create_HistGradientBoostingRegressor_hyperparameter_grid(self):
-        """
-        Creates a hyperparameter grid for HistGradientBoostingRegressor based on user input.
+        lineedits = self.hyperparameter_lineedits[backend.name]
 
-        Returns:
-            dict or None: Hyperparameter grid if successful, None otherwise.
-        """
-        # Retrieve hyperparameters values from GUI inputs
+        # Retrieve hyperparameter values from GUI inputs
         try:
-            max_iter_values = re.split(r'\s|[,;]', self.max_iter_sci.text())
-            learning_rate_values = re.split(r'\s|[,;]', self.learning_rate_sci.text())
-            max_depth_values = re.split(r'\s|[,;]', self.max_depth_sci.text())
-            num_leaves_values = re.split(r'\s|[,;]', self.max_leaf_nodes_sci.text())
-            max_features_values = re.split(r'\s|[,;]', self.max_features_sci.text())
+            values = {
+                key: [value for value in re.split(r'\s|[,;]', lineedits[key].text()) if value.strip()]
+                for key, _, _, _ in backend.hyperparameter_schema
+            }
         except Exception as e:
             QMessageBox.warning(self, "Input Error", f"Error parsing hyperparameter inputs: {e}")
             return None
 
         # Validate that all input lists are non-empty
-        if not all([max_iter_values, learning_rate_values, max_depth_values, num_leaves_values, max_features_values]):
+        if not all(values.values()):
             QMessageBox.warning(self, "Input Required", "Please fill in all hyperparameters.")
             return None
 
         # Check if all lengths of hyperparameter lists are equal
-        lengths = {
-            'max_iter': len(max_iter_values),
-            'learning_rate': len(learning_rate_values),
-            'max_depth': len(max_depth_values),
-            'max_leaf_nodes': len(num_leaves_values),
-            'max_features': len(max_features_values)
-        }
+        lengths = {key: len(key_values) for key, key_values in values.items()}
 
-        if len(set(lengths.values())) != 1:
+        if self.search_strategy_combo.currentText() == SEARCH_STRATEGIES[0] and len(set(lengths.values())) != 1:
             QMessageBox.warning(self, "Input Error", "Number of values for each hyperparameter must be equal.")
             return None
 
         try:
             # Create hyperparameters grid based on user input
             hyperparameters_grid = {
-                'max_iter': [int(value) for value in max_iter_values],
-                'learning_rate': [float(value) for value in learning_rate_values],
-                'max_depth': [int(value) for value in max_depth_values],
-                'max_leaf_nodes': [int(eval(value)) for value in num_leaves_values],
-                'max_features': [float(value) for value in max_features_values]
+                key: [parser(value) for value in values[key]]
+                for key, _, _, parser in backend.hyperparameter_schema
             }
         except ValueError as ve:
             QMessageBox.warning(self, "Input Error", f"ValueError: {ve}")
@@ -1675,110 +1959,2459 @@ class Platform(QWidget):
             return None
 
         # Clear the input fields
-        self.max_iter_sci.clear()
-        self.learning_rate_sci.clear()
-        self.max_depth_sci.clear()
-        self.max_leaf_nodes_sci.clear()
-        self.max_features_sci.clear()
+        for lineedit in lineedits.values():
+            lineedit.clear()
+
+        return hyperparameters_grid                                       
+           
+def compact_arrow_schema(source_schema, columns):
+    """
+    Builds the Arrow schema used for compact loading: integer features become int8,
+    floating point columns (targets) become float32 and a string era becomes a dictionary,
+    which pandas turns into a categorical column. Other columns keep their source type.
+    """
+    fields = []
+    for name in columns:
+        field = source_schema.field(name)
+        if name.startswith("feature") and pa.types.is_integer(field.type):
+            fields.append(pa.field(name, pa.int8()))
+        elif pa.types.is_floating(field.type):
+            fields.append(pa.field(name, pa.float32()))
+        elif name == "era" and pa.types.is_string(field.type):
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(field)
+    return pa.schema(fields, metadata=source_schema.metadata)
+
+def era_filter_expression(eras_to_exclude=None, era_start=None, era_end=None, eras_to_keep=None):
+    """
+    Builds a pyarrow dataset expression on the era column, or None when nothing is filtered.
+    Eras are zero padded strings, so the window bounds compare lexicographically.
+    """
+    expressions = []
+    if eras_to_keep is not None:
+        expressions.append(ds.field("era").isin(list(eras_to_keep)))
+    if eras_to_exclude:
+        expressions.append(~ds.field("era").isin(list(eras_to_exclude)))
+    if era_start is not None:
+        expressions.append(ds.field("era") >= era_start)
+    if era_end is not None:
+        expressions.append(ds.field("era") <= era_end)
+
+    filter_expression = None
+    for expression in expressions:
+        filter_expression = expression if filter_expression is None else filter_expression & expression
+    return filter_expression
+
+def select_strided_eras(full_file_path, era_stride, filter_expression=None):
+    """
+    Scans only the era column of a parquet file and returns every era_stride-th era,
+    in order, among the eras matching filter_expression.
+    """
+    eras = ds.dataset(full_file_path, format="parquet").to_table(columns=["era"], filter=filter_expression)["era"]
+    unique_eras = sorted(eras.unique().to_pylist())
+    return unique_eras[::era_stride]
+
+def read_numerai_parquet(full_file_path, columns, compact=False, filter_expression=None):
+    """
+    Reads the given columns of a Numerai parquet file into a DataFrame.
+
+    A filter_expression is pushed down to the parquet reader: row groups whose statistics
+    cannot match are skipped and filtered rows never reach pandas. Filter columns do not
+    need to be part of the selected columns.
+
+    With compact=True every record batch is cast to the compact schema as it is read,
+    so the full-width frame is never materialized, and the memory saved is printed.
+    """
+    if not compact:
+        return pd.read_parquet(full_file_path, columns=columns, filters=filter_expression)
+
+    dataset = ds.dataset(full_file_path, format="parquet")
+    index_columns = [name for name in (dataset.schema.pandas_metadata or {}).get("index_columns", []) if isinstance(name, str)]
+    read_columns = columns + [name for name in index_columns if name not in columns]
+    target_schema = compact_arrow_schema(dataset.schema, read_columns)
+
+    batches = [batch.cast(target_schema) for batch in dataset.to_batches(columns=read_columns, filter=filter_expression)]
+    frame = pa.Table.from_batches(batches, schema=target_schema).to_pandas()
+
+    # Bytes saved on the fixed-width columns whose type was narrowed
+    saved_bytes = 0
+    for name in read_columns:
+        source_type = dataset.schema.field(name).type
+        target_type = target_schema.field(name).type
+        if source_type != target_type and pa.types.is_primitive(source_type) and pa.types.is_primitive(target_type):
+            saved_bytes += len(frame) * (source_type.bit_width - target_type.bit_width) // 8
+    frame_bytes = frame.memory_usage(deep=True).sum()
+    print(f"Compact load of {os.path.basename(full_file_path)}: {frame.shape[0]} rows x {frame.shape[1]} columns, "
+          f"{frame_bytes / 1024 ** 2:.1f} MB in memory, {saved_bytes / 1024 ** 2:.1f} MB saved compared to default dtypes")
+    return frame
+
+class DatasetFolderManifest:
+    """
+    Persistent index of the dataset files below a folder: relative path, size, modification
+    time and the roles (feature, validation, train, meta_model) each file is listed under.
+
+    The manifest and the modification time of every directory are saved in the cache folder.
+    A refresh only rescans directories whose modification time changed, and returns the
+    files added and removed so list widgets receive diffs. Hidden folders such as the cache
+    are skipped.
+    """
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.manifest_path = os.path.join(folder_path, CACHE_FOLDER_NAME, "dataset_manifest.json")
+        self.files = {}
+        self.directories = {}
+        try:
+            with open(self.manifest_path, 'r') as file:
+                manifest = json.load(file)
+            self.files = manifest["files"]
+            self.directories = manifest["directories"]
+        except (OSError, ValueError, KeyError):
+            # Missing or unreadable manifest, every directory is scanned on the first refresh
+            self.directories = {".": None}
+
+    @staticmethod
+    def classify(relative_path) -> list:
+        path_lower = relative_path.lower()
+        return [role for role, marker in (("feature", "feature"), ("validation", "validation"), ("train", "train"), ("meta_model", "meta_model")) if marker in path_lower]
+
+    def items(self) -> list:
+        return [(relative_path, entry["roles"]) for relative_path, entry in self.files.items()]
+
+    def directory_paths(self) -> list:
+        return [os.path.normpath(os.path.join(self.folder_path, directory)) for directory in self.directories]
 
-        return hyperparameters_grid  
-                                  
-    def create_lgbm_hyperparameter_grid(self):
+    def relative_directory(self, directory_path) -> str:
+        return os.path.relpath(directory_path, self.folder_path).replace('\\', '/')
+
+    def refresh(self, directories=None):
         """
-        Creates a hyperparameter grid for LGBMRegressor based on user input.
+        Rescans the given directories, or every known directory whose modification time changed.
 
         Returns:
-            dict or None: Hyperparameter grid if successful, None otherwise.
+            tuple: (added, removed) lists of (relative_path, roles).
         """
-        # Retrieve hyperparameter values from GUI inputs
+        if directories is None:
+            pending = []
+            for directory in list(self.directories):
+                try:
+                    if os.stat(os.path.join(self.folder_path, directory)).st_mtime_ns != self.directories[directory]:
+                        pending.append(directory)
+                except OSError:
+                    pending.append(directory)
+        else:
+            pending = [self.relative_directory(directory) for directory in directories]
+
+        added, removed = [], []
+        while pending:
+            directory = pending.pop()
+            new_directories = self.scan_directory(directory, added, removed)
+            pending.extend(new_directories)
+
+        if added or removed or directories is None:
+            self.save()
+        return added, removed
+
+    def scan_directory(self, directory, added, removed) -> list:
+        """
+        Rescans one directory, recording file changes, and returns the subdirectories not yet indexed.
+        """
+        directory_path = os.path.join(self.folder_path, directory)
+        parent = "" if directory == "." else directory
+        prefix = "" if directory == "." else f"{directory}/"
+        previous_files = {path for path in self.files if os.path.dirname(path) == parent}
+        previous_subdirectories = {name for name in self.directories if name != directory and os.path.dirname(name) == parent}
+
+        if not os.path.isdir(directory_path):
+            # The directory was removed, drop everything indexed below it
+            for path in [path for path in self.files if path.startswith(prefix)]:
+                removed.append((path, self.files.pop(path)["roles"]))
+            for name in [name for name in self.directories if name == directory or name.startswith(prefix)]:
+                del self.directories[name]
+            return []
+
+        self.directories[directory] = os.stat(directory_path).st_mtime_ns
+        current_files, current_subdirectories = set(), set()
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                relative_path = f"{prefix}{entry.name}"
+                if entry.is_dir():
+                    current_subdirectories.add(relative_path)
+                elif entry.name.endswith(DATASET_FILE_EXTENSIONS):
+                    current_files.add(relative_path)
+                    file_stat = entry.stat()
+                    if relative_path not in self.files:
+                        self.files[relative_path] = {"size": file_stat.st_size, "mtime": file_stat.st_mtime_ns, "roles": self.classify(relative_path)}
+                        added.append((relative_path, self.files[relative_path]["roles"]))
+                    else:
+                        self.files[relative_path].update(size=file_stat.st_size, mtime=file_stat.st_mtime_ns)
+
+        for path in previous_files - current_files:
+            removed.append((path, self.files.pop(path)["roles"]))
+
+        # Removed subdirectories are cleaned up by rescanning them, new ones are scanned in full
+        return list(current_subdirectories - previous_subdirectories) + list(previous_subdirectories - current_subdirectories)
+
+    def save(self) -> None:
         try:
-            n_estimators_values = re.split(r'\s|[,;]', self.n_estimators.text())
-            learning_rate_values = re.split(r'\s|[,;]', self.learning_rate.text())
-            max_depth_values = re.split(r'\s|[,;]', self.max_depth.text())
-            num_leaves_values = re.split(r'\s|[,;]', self.num_leaves.text())
-            colsample_bytree_values = re.split(r'\s|[,;]', self.colsample_bytree.text())
-        except Exception as e:
-            QMessageBox.warning(self, "Input Error", f"Error parsing hyperparameter inputs: {e}")
-            return None
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(self.manifest_path, 'w') as file:
+                json.dump({"files": self.files, "directories": self.directories}, file)
+        except OSError as e:
+            print(f"Could not save dataset manifest {self.manifest_path}: {e}")
+
+class FeatureMetadataIndex:
+    """
+    Parsed feature metadata (features.json) files, indexed by feature set.
+
+    Each file is parsed once and re-parsed only when its size or modification time
+    changes. The index holds the feature sets, their sizes and, for every feature,
+    the feature sets it belongs to.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def entry(self, full_file_path) -> dict:
+        file_stat = os.stat(full_file_path)
+        file_key = (file_stat.st_size, file_stat.st_mtime_ns)
+        cached = self.entries.get(full_file_path)
+        if cached is not None and cached["file_key"] == file_key:
+            return cached
+
+        with open(full_file_path, 'r') as file:
+            feature_metadata = json.load(file)
+
+        feature_sets = feature_metadata.get("feature_sets", {})
+        feature_membership = {}
+        for feature_set_name, features in feature_sets.items():
+            for feature in features:
+                feature_membership.setdefault(feature, []).append(feature_set_name)
+
+        cached = {
+            "file_key": file_key,
+            "feature_sets": feature_sets,
+            "feature_set_sizes": {name: len(features) for name, features in feature_sets.items()},
+            "feature_membership": feature_membership,
+        }
+        self.entries[full_file_path] = cached
+        return cached
+
+    def feature_set_sizes(self, full_file_path) -> dict:
+        return self.entry(full_file_path)["feature_set_sizes"]
+
+    def feature_set(self, full_file_path, feature_set_name):
+        features = self.entry(full_file_path)["feature_sets"].get(feature_set_name)
+        return list(features) if features is not None else None
+
+    def feature_sets_containing(self, full_file_path, feature) -> list:
+        return self.entry(full_file_path)["feature_membership"].get(feature, [])
+
+def lightgbm_train_params(hyperparameters):
+    """
+    Converts grid hyperparameters into lgb.train parameters with the same defaults as
+    LGBMRegressor, returning the parameters and the number of boosting rounds (n_estimators).
+    """
+    params = {"objective": "regression", "verbosity": -1, **hyperparameters}
+    num_boost_round = params.pop("n_estimators", 100)
+    return params, num_boost_round
+
+def take_rows(data, rows):
+    """
+    Selects rows by position from a DataFrame, Series or numpy array.
+    """
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
+
+def rank_within_eras(values, era_codes):
+    """
+    Tie-kept percentile ranks of values within each era, (rank - 0.5) / count like
+    numerai_tools.scoring.rank, for all eras at once.
+
+    Rows are sorted once by (era, value) and tied runs get their average rank, so no
+    per-era Python loop is needed. values must not contain NaN.
+
+    As tied rows share their average rank, the value sort does not have to be stable;
+    a stable sort by era code (a radix sort for 16 bit codes) then groups the rows by era
+    and keeps the value order within each era.
+
+    Args:
+        values (np.ndarray): Values to rank.
+        era_codes (np.ndarray): Integer era code of each row, from 0 to the number of eras - 1.
+
+    Returns:
+        np.ndarray: Percentile ranks in the original row order.
+    """
+    order = np.argsort(values)
+    era_code_dtype = np.uint16 if len(era_codes) == 0 or era_codes.max() < 2 ** 16 else era_codes.dtype
+    order = order[np.argsort(era_codes[order].astype(era_code_dtype, copy=False), kind="stable")]
+    sorted_values = values[order]
+    sorted_eras = era_codes[order]
+    positions = np.arange(len(values))
+
+    # A new era or a new value starts a run of tied rows
+    era_starts = np.r_[True, sorted_eras[1:] != sorted_eras[:-1]]
+    run_starts = era_starts | np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+    era_first = np.maximum.accumulate(np.where(era_starts, positions, 0))
+    run_first = np.maximum.accumulate(np.where(run_starts, positions, 0))
+    run_last = np.append(np.flatnonzero(run_starts)[1:], len(values)) - 1
+
+    # Average of the 1-based ranks inside the era over each tied run
+    sorted_ranks = (run_first + run_last[np.cumsum(run_starts) - 1]) / 2 - era_first + 1
+    era_counts = np.bincount(era_codes)
+    ranks = np.empty(len(values))
+    ranks[order] = (sorted_ranks - 0.5) / era_counts[sorted_eras]
+    return ranks
+
+def center_within_eras(values, era_codes, era_counts):
+    """
+    Subtracts the per-era mean from values, using bincount segment sums.
+    """
+    return values - (np.bincount(era_codes, weights=values, minlength=len(era_counts)) / era_counts)[era_codes]
+
+def signed_power(values, exponent=1.5):
+    return np.sign(values) * np.abs(values) ** exponent
+
+def gaussianize_within_eras(values, era_codes):
+    """
+    Tie-kept ranks of values within each era mapped through the normal percent point function,
+    as numerai_tools.scoring.gaussian(tie_kept_rank(...)) per era.
+    """
+    return ndtri(rank_within_eras(values, era_codes))
+
+class NumeraiCorrelationEval:
+    """
+    LightGBM eval function scoring predictions by their mean per-era Numerai correlation.
+
+    Each era follows numerai_tools.scoring.numerai_corr: the target is centered and raised
+    to the 1.5 power, and the predictions are tie-kept ranked, gaussianized and raised to
+    the 1.5 power before the Pearson correlation. The target side is prepared once, so an
+    evaluation only transforms the new predictions and reduces all eras with segment sums.
+    """
+    def __init__(self, eras, target, target_is_centered=False):
+        era_codes, self.era_names = pd.factorize(np.asarray(eras), sort=True)
+        self.era_codes = era_codes
+        self.era_counts = np.bincount(era_codes)
+        target = np.asarray(target, dtype=np.float64)
+        if not target_is_centered:
+            target = center_within_eras(target, era_codes, self.era_counts)
+        target_power = signed_power(target)
+        self.target_centered = center_within_eras(target_power, era_codes, self.era_counts)
+        self.target_norms = np.sqrt(np.bincount(era_codes, weights=self.target_centered ** 2))
+
+    def per_era_correlation(self, predictions) -> np.ndarray:
+        return self.per_era_correlation_of_gaussianized(
+            gaussianize_within_eras(np.asarray(predictions, dtype=np.float64), self.era_codes)
+        )
+
+    def per_era_correlation_of_gaussianized(self, gaussianized) -> np.ndarray:
+        """
+        Per-era correlation of predictions already gaussianized by gaussianize_within_eras.
+        """
+        predictions_centered = center_within_eras(signed_power(gaussianized), self.era_codes, self.era_counts)
+        covariance = np.bincount(self.era_codes, weights=predictions_centered * self.target_centered)
+        predictions_norms = np.sqrt(np.bincount(self.era_codes, weights=predictions_centered ** 2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return covariance / (predictions_norms * self.target_norms)
+
+    def __call__(self, predictions, eval_data):
+        # Eras where every prediction ties have no correlation and count as 0
+        return "numerai_corr", float(np.nan_to_num(self.per_era_correlation(predictions)).mean()), True
+
+def prediction_matrix(predictions):
+    """
+    Returns predictions as a float64 rows x models matrix and the column names, "prediction"
+    for a single unnamed column.
+    """
+    if isinstance(predictions, pd.DataFrame):
+        columns = list(predictions.columns)
+    elif np.ndim(predictions) == 1:
+        columns = [predictions.name if getattr(predictions, "name", None) is not None else "prediction"]
+    else:
+        columns = list(range(np.shape(predictions)[1]))
+    return np.asarray(predictions, dtype=np.float64).reshape(len(predictions), len(columns)), columns
+
+def per_era_numerai_corr(predictions, target, eras) -> pd.DataFrame:
+    """
+    Per-era Numerai correlation of one prediction column, equal to
+    groupby("era").apply(lambda x: numerai_corr(x[["prediction"]].dropna(), x["target"].dropna()))
+    but computed for every era at once by NumeraiCorrelationEval.
+
+    As in that call the target is centered over every row of the era that has a target,
+    before the rows without a prediction are dropped. Eras without a scored row are left out.
+
+    Returns:
+        pd.DataFrame: Correlation per era in a "prediction" column, indexed by era.
+    """
+    predictions = np.asarray(predictions, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    era_codes, _ = pd.factorize(np.asarray(eras), sort=True)
+
+    has_target = ~np.isnan(target)
+    target_means = (
+        np.bincount(era_codes[has_target], weights=target[has_target], minlength=era_codes.max() + 1)
+        / np.bincount(era_codes[has_target], minlength=era_codes.max() + 1)
+    )
+    scored_rows = np.flatnonzero(has_target & ~np.isnan(predictions))
+    correlation = NumeraiCorrelationEval(
+        np.asarray(eras)[scored_rows], target[scored_rows] - target_means[era_codes[scored_rows]], target_is_centered=True
+    )
+    return pd.DataFrame(
+        {"prediction": correlation.per_era_correlation(predictions[scored_rows])},
+        index=pd.Index(correlation.era_names, name="era")
+    )
+
+def per_era_correlation_contribution(predictions, meta_model, target, eras) -> pd.DataFrame:
+    """
+    Per-era meta model contribution of one or more prediction columns, equal to
+    groupby("era").apply(lambda x: correlation_contribution(x[columns], x["meta_model"], x["target"]))
+    on the rows without a missing value, but computed for every era and column at once
+    by a ScoringContext of those rows.
+
+    Args:
+        predictions (pd.Series, pd.DataFrame or np.ndarray): One prediction column, or a rows x models matrix.
+        meta_model (array-like): Meta model prediction of each row.
+        target (array-like): Target of each row.
+        eras (array-like): Era of each row.
+
+    Returns:
+        pd.DataFrame: Contribution per era, indexed by era with one column per prediction column.
+    """
+    predictions, columns = prediction_matrix(predictions)
+    meta_model = np.asarray(meta_model, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+
+    # Like dropna() before the groupby, a row missing any value is left out of every column
+    scored_rows = np.flatnonzero(~np.isnan(meta_model) & ~np.isnan(target) & ~np.isnan(predictions).any(axis=1))
+    scoring_context = ScoringContext(np.asarray(eras)[scored_rows], target[scored_rows], meta_model[scored_rows])
+    return scoring_context.per_era_mmc(pd.DataFrame(predictions[scored_rows], columns=columns))
+
+class ScoringContext:
+    """
+    Target and meta model side of the per-era CORR and MMC scores of one validation set,
+    prepared once so that scoring a model only ranks and gaussianizes its own predictions.
+
+    CORR uses the rows with a target: the target is centered per era, raised to the 1.5
+    power and its per-era norms are kept by a NumeraiCorrelationEval. MMC uses the rows that
+    also have a meta model value: the meta model is gaussianized per era and the target is
+    turned into centered buckets. Orthogonalizing a prediction p against the meta model m
+    before the dot product with the target t is written as t.p - (t.m)(p.m)/(m.m), so the
+    meta model terms m.m and t.m are per-era sums computed here, and set_meta_model only
+    rebuilds this side when the meta model file changes.
+
+    Predictions are given for every row of the validation set in its order. Predictions
+    with missing values fall back to per_era_numerai_corr and per_era_correlation_contribution,
+    which drop those rows first.
+
+    The context is also the one copy of the validation ids, eras, target and meta model
+    shared by the ModelResult records scored against it.
+    """
+    def __init__(self, eras, target, meta_model=None, index=None):
+        self.eras = np.asarray(eras)
+        self.target = np.asarray(target, dtype=np.float64)
+        self.index = pd.RangeIndex(len(self.target)) if index is None else index
+
+        self.correlation_rows = np.flatnonzero(~np.isnan(self.target))
+        era_codes, _ = pd.factorize(self.eras[self.correlation_rows], sort=True)
+        target_centered = center_within_eras(self.target[self.correlation_rows], era_codes, np.bincount(era_codes))
+        self.correlation = NumeraiCorrelationEval(self.eras[self.correlation_rows], target_centered, target_is_centered=True)
+        self.set_meta_model(meta_model)
+
+    def set_meta_model(self, meta_model):
+        """
+        Prepares the MMC side for a new meta model column aligned to the validation rows.
+        """
+        self.meta_model = None if meta_model is None else np.asarray(meta_model, dtype=np.float64)
+        if self.meta_model is None:
+            self.contribution_rows = None
+            return
 
-        # Validate that all input lists are non-empty
-        if not all([n_estimators_values, learning_rate_values, max_depth_values, num_leaves_values, colsample_bytree_values]):
-            QMessageBox.warning(self, "Input Required", "Please fill in all hyperparameters.")
-            return None
+        self.contribution_rows = np.flatnonzero(~np.isnan(self.meta_model) & ~np.isnan(self.target))
+        era_codes, era_names = pd.factorize(self.eras[self.contribution_rows], sort=True)
+        era_counts = np.bincount(era_codes)
+        self.contribution_era_codes = era_codes
+        self.contribution_era_names = era_names
+        self.contribution_era_counts = era_counts
 
-        # Check if all lengths of hyperparameter lists are equal
-        lengths = {
-            'n_estimators': len(n_estimators_values),
-            'learning_rate': len(learning_rate_values),
-            'max_depth': len(max_depth_values),
-            'num_leaves': len(num_leaves_values),
-            'colsample_bytree': len(colsample_bytree_values)
+        self.meta_gaussian = gaussianize_within_eras(self.meta_model[self.contribution_rows], era_codes)
+        self.meta_norms = np.bincount(era_codes, weights=self.meta_gaussian ** 2)
+
+        # Targets of an era lying in [0, 1] are turned into buckets from -2 to 2 before centering
+        target = self.target[self.contribution_rows]
+        outside_unit = np.bincount(era_codes, weights=(target < 0) | (target > 1), minlength=len(era_counts))
+        target = np.where(outside_unit[era_codes] == 0, target * 4, target)
+        self.contribution_target = center_within_eras(target, era_codes, era_counts)
+        self.target_meta = np.bincount(era_codes, weights=self.contribution_target * self.meta_gaussian)
+
+    def per_era_corr(self, predictions) -> pd.DataFrame:
+        """
+        Per-era Numerai correlation of each prediction column, as per_era_numerai_corr.
+
+        Returns:
+            pd.DataFrame: Correlation per era, indexed by era with one column per prediction column.
+        """
+        matrix, columns = prediction_matrix(predictions)
+        if np.isnan(matrix[self.correlation_rows]).any():
+            return pd.concat([
+                per_era_numerai_corr(column_values, self.target, self.eras)["prediction"].rename(column)
+                for column, column_values in zip(columns, matrix.T)
+            ], axis=1)
+
+        correlations = np.column_stack([
+            self.correlation.per_era_correlation(column_values) for column_values in matrix[self.correlation_rows].T
+        ])
+        return pd.DataFrame(correlations, columns=columns, index=pd.Index(self.correlation.era_names, name="era"))
+
+    def per_era_mmc(self, predictions) -> pd.DataFrame:
+        """
+        Per-era meta model contribution of each prediction column, as per_era_correlation_contribution.
+
+        Returns:
+            pd.DataFrame: Contribution per era, indexed by era with one column per prediction column.
+        """
+        if self.meta_model is None:
+            raise ValueError("The scoring context has no meta model.")
+        matrix, columns = prediction_matrix(predictions)
+        if np.isnan(matrix[self.contribution_rows]).any():
+            return per_era_correlation_contribution(pd.DataFrame(matrix, columns=columns), self.meta_model, self.target, self.eras)
+
+        contributions = np.column_stack([
+            self.per_era_mmc_of_gaussianized(gaussianize_within_eras(column_values, self.contribution_era_codes))
+            for column_values in matrix[self.contribution_rows].T
+        ])
+        return pd.DataFrame(contributions, columns=columns, index=pd.Index(self.contribution_era_names, name="era"))
+
+    def per_era_mmc_of_gaussianized(self, gaussianized) -> np.ndarray:
+        """
+        Per-era meta model contribution of one prediction column of the MMC rows, already
+        gaussianized by gaussianize_within_eras.
+        """
+        era_codes = self.contribution_era_codes
+        target_prediction = np.bincount(era_codes, weights=self.contribution_target * gaussianized)
+        prediction_meta = np.bincount(era_codes, weights=gaussianized * self.meta_gaussian)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (target_prediction - self.target_meta * prediction_meta / self.meta_norms) / self.contribution_era_counts
+
+    def score(self, predictions):
+        """
+        Scores a rows x models predictions matrix aligned to the validation rows.
+
+        When every row with a target also has a meta model value, CORR and MMC share the
+        same rows and each prediction column is ranked and gaussianized only once for both.
+
+        Returns:
+            tuple: (per_era_corr, per_era_mmc, summary). The per-era frames have one column per
+            model, the summary has one row per model with the RESULT_SCORE_COLUMNS statistics.
+        """
+        matrix, columns = prediction_matrix(predictions)
+        shared_rows = self.meta_model is not None and np.array_equal(self.correlation_rows, self.contribution_rows)
+        if shared_rows and not np.isnan(matrix[self.correlation_rows]).any():
+            correlations = np.empty((len(self.correlation.era_counts), len(columns)))
+            contributions = np.empty((len(self.contribution_era_counts), len(columns)))
+            for column, column_values in enumerate(matrix[self.correlation_rows].T):
+                gaussianized = gaussianize_within_eras(column_values, self.correlation.era_codes)
+                correlations[:, column] = self.correlation.per_era_correlation_of_gaussianized(gaussianized)
+                contributions[:, column] = self.per_era_mmc_of_gaussianized(gaussianized)
+            per_era_corr = pd.DataFrame(correlations, columns=columns, index=pd.Index(self.correlation.era_names, name="era"))
+            per_era_mmc = pd.DataFrame(contributions, columns=columns, index=pd.Index(self.contribution_era_names, name="era"))
+        else:
+            per_era_corr = self.per_era_corr(predictions)
+            per_era_mmc = self.per_era_mmc(predictions)
+        summary = pd.concat([summary_statistics(per_era_corr, "corr"), summary_statistics(per_era_mmc, "mmc")], axis=1)
+        return per_era_corr, per_era_mmc, summary[RESULT_SCORE_COLUMNS]
+
+def summary_statistics(per_era_scores, prefix) -> pd.DataFrame:
+    """
+    Mean, population std, sharpe and maximum drawdown of the cumulative score of every column
+    of a per-era score matrix, for all columns at once.
+
+    Returns:
+        pd.DataFrame: One row per column with {prefix}_mean, {prefix}_std, {prefix}_sharpe and {prefix}_max_drawdown.
+    """
+    cumulative = per_era_scores.cumsum()
+    mean = per_era_scores.mean()
+    std = per_era_scores.std(ddof=0)
+    return pd.DataFrame({
+        f"{prefix}_mean": mean,
+        f"{prefix}_std": std,
+        f"{prefix}_sharpe": mean / std,
+        f"{prefix}_max_drawdown": (cumulative.cummax() - cumulative).max(),
+    })
+
+class EarlyStoppingHoldout:
+    """
+    Trailing block of training eras held out to stop LightGBM once the mean per-era Numerai
+    correlation of the block stops improving.
+
+    The last holdout_eras training eras form the block. Eras within EARLY_STOPPING_EMBARGO_ERAS
+    before it are left out of the fit rows, as their targets overlap the holdout in time.
+    The object only holds row positions and the prepared eval function, so it is sent to
+    the parallel sweep workers as it is.
+    """
+    def __init__(self, eras, target, holdout_eras, stopping_rounds):
+        era_numbers = np.asarray(eras).astype(np.int64)
+        target = np.asarray(target, dtype=np.float64)
+        unique_eras = np.unique(era_numbers)
+        if len(unique_eras) <= holdout_eras:
+            raise ValueError(f"Early stopping needs more than {holdout_eras} training eras, the training data has {len(unique_eras)}.")
+
+        self.holdout_eras = holdout_eras
+        self.stopping_rounds = stopping_rounds
+        self.first_holdout_era = int(unique_eras[-holdout_eras])
+        self.fit_rows = np.flatnonzero(era_numbers < self.first_holdout_era - EARLY_STOPPING_EMBARGO_ERAS)
+        self.holdout_rows = np.flatnonzero((era_numbers >= self.first_holdout_era) & ~np.isnan(target))
+        if len(self.fit_rows) == 0:
+            raise ValueError("No training eras are left before the early stopping holdout and its embargo.")
+        self.eval_function = NumeraiCorrelationEval(era_numbers[self.holdout_rows], target[self.holdout_rows])
+        self.holdout_data = None
+
+    def fit_key(self, training_data_key) -> str:
+        return f"{training_data_key}_holdout{self.first_holdout_era}"
+
+    def fit_data(self, features, target):
+        return take_rows(features, self.fit_rows), take_rows(target, self.fit_rows)
+
+    def train(self, params, train_set, num_boost_round, features_and_label, callbacks=()):
+        """
+        Trains on train_set (built from fit_data) with the holdout rows as the early stopping
+        set, returning the booster with best_iteration set. features_and_label returns the
+        full training features and target; it is only called for the first model.
+        """
+        if self.holdout_data is None:
+            features, target = features_and_label()
+            self.holdout_data = (take_rows(features, self.holdout_rows), take_rows(target, self.holdout_rows))
+        holdout_set = lgb.Dataset(self.holdout_data[0], label=self.holdout_data[1], reference=train_set)
+
+        # Only the custom per-era correlation is evaluated on the holdout
+        params = {**params, "metric": "None"}
+        return lgb.train(
+            params, train_set, num_boost_round=num_boost_round,
+            valid_sets=[holdout_set], valid_names=["holdout"], feval=self.eval_function,
+            callbacks=[*callbacks, lgb.early_stopping(self.stopping_rounds, verbose=False)]
+        )
+
+def expand_hyperparameter_grid(hyperparameters_grid, search_strategy=SEARCH_STRATEGIES[0], search_budget=None, seed=0) -> list:
+    """
+    Turns the values entered for each hyperparameter into grid rows.
+
+    Paired rows zips the i-th value of every hyperparameter, so all value lists must have the
+    same length. Cartesian product tries every combination. Random sample and the halving
+    searches draw search_budget distinct combinations of the Cartesian product, or use
+    all of them when no budget is given. Combinations are decoded from their position in
+    the product, so the product is never built in memory.
+
+    Args:
+        hyperparameters_grid (dict): Values entered for each hyperparameter.
+        search_strategy (str): One of SEARCH_STRATEGIES.
+        search_budget (int, optional): Number of combinations to sample.
+        seed (int): Seed of the random sample.
+
+    Returns:
+        list: Grid rows as dictionaries.
+    """
+    keys = list(hyperparameters_grid)
+    if search_strategy == SEARCH_STRATEGIES[0]:
+        lengths = {len(values) for values in hyperparameters_grid.values()}
+        if len(lengths) != 1:
+            raise ValueError("Number of values for each hyperparameter must be equal.")
+        return [{key: hyperparameters_grid[key][i] for key in keys} for i in range(lengths.pop())]
+
+    if search_strategy == SEARCH_STRATEGIES[1] or search_budget is None:
+        return [dict(zip(keys, values)) for values in itertools.product(*hyperparameters_grid.values())]
+
+    sizes = [len(hyperparameters_grid[key]) for key in keys]
+    combinations = math.prod(sizes)
+    positions = sorted(random.Random(seed).sample(range(combinations), min(search_budget, combinations)))
+    rows = []
+    for position in positions:
+        row = {}
+        for key, size in zip(reversed(keys), reversed(sizes)):
+            position, value_index = divmod(position, size)
+            row[key] = hyperparameters_grid[key][value_index]
+        rows.append({key: row[key] for key in keys})
+    return rows
+
+def plan_shared_fits(hyperparameter_rows, tree_count_key=None) -> list:
+    """
+    Groups grid rows that only differ in their tree count, so each group is fitted once
+    with its largest count and every row is scored from that fit.
+
+    Args:
+        hyperparameter_rows (list): Grid rows as dictionaries.
+        tree_count_key (str, optional): Hyperparameter holding the tree count, None fits every row on its own.
+
+    Returns:
+        list: Lists of row indices, the row with the largest tree count first, in grid order.
+    """
+    if tree_count_key is None:
+        return [[i] for i in range(len(hyperparameter_rows))]
+
+    groups = {}
+    for i, hyperparameters in enumerate(hyperparameter_rows):
+        other_hyperparameters = tuple(sorted((key, value) for key, value in hyperparameters.items() if key != tree_count_key))
+        groups.setdefault(other_hyperparameters, []).append(i)
+    return [
+        sorted(group, key=lambda i: -hyperparameter_rows[i].get(tree_count_key, 0))
+        for group in groups.values()
+    ]
+
+def parse_integer_expression(value):
+    # Leaf counts may be entered as expressions like 2**5
+    return int(eval(value))
+
+class EstimatorBackend:
+    """
+    Training method offered on the Train page.
+
+    A backend declares the hyperparameters entered for it as (key, label, placeholder, parser)
+    entries, the hyperparameter holding its tree count and how its thread count is limited.
+    The sweep fits, predicts and truncates models only through these methods, so a backend
+    is added by registering it in ESTIMATOR_BACKENDS.
+    """
+    name = None
+    tree_count_key = None
+    hyperparameter_schema = ()
+    # Backends that can be fitted on the process pool of ParallelSweepExecutor
+    supports_process_pool = False
+    supports_early_stopping = False
+    # Extension of the files written by save_model
+    model_file_extension = ".pkl"
+
+    def available(self) -> bool:
+        return True
+
+    def save_model(self, model, path) -> None:
+        """
+        Writes a fitted model to path, in the library's native format where it has one.
+        """
+        with open(path, "wb") as file:
+            cloudpickle.dump(model, file)
+
+    def load_model(self, path):
+        """
+        Reads a model written by save_model.
+        """
+        with open(path, "rb") as file:
+            return cloudpickle.load(file)
+
+    def fit(self, hyperparameters, train, selected_feature_sets, sweep, num_threads=None):
+        """
+        Fits one grid row on the training frame. sweep is the running SweepWorker, giving
+        access to its caches, early stopping holdout and cancel event.
+        """
+        raise NotImplementedError
+
+    def predict(self, model, features) -> np.ndarray:
+        """
+        Predicts one batch of the selected feature columns.
+        """
+        return model.predict(features)
+
+    def truncate(self, model, tree_count):
+        """
+        Returns a model predicting with the first tree_count trees of model.
+        """
+        raise NotImplementedError
+
+    def staged_predict(self, model, features, tree_counts) -> np.ndarray:
+        """
+        Predicts one batch with the first tree_counts[k] trees for every k, one column per count.
+        """
+        return np.column_stack([self.predict(self.truncate(model, count), features) for count in tree_counts])
+
+class LightGBMBackend(EstimatorBackend):
+    name = "LGBMRegressor"
+    tree_count_key = "n_estimators"
+    hyperparameter_schema = (
+        ("n_estimators", "Number of boosted trees to fit",
+         "Please input Integer values like 2000. For multiple values, separate them with commas like 2000, 3000", int),
+        ("learning_rate", "Boosting learning rate",
+         "Please input float values like 0.01. For multiple values, separate them with commas like 0.01, 0.02", float),
+        ("max_depth", "Maximum tree depth for base learners",
+         "Please input Integer values like 5. For multiple values, separate them with commas like 5, 6", int),
+        ("num_leaves", "Maximum tree leaves for base learners",
+         "Please input Integer values like 30. For multiple values, separate them with commas like 30, 31", parse_integer_expression),
+        ("colsample_bytree", "Subsample ratio of columns when constructing each tree",
+         "Please input float values like 0.1. For multiple values, separate them with commas like 0.1, 0.25", float),
+    )
+    supports_process_pool = True
+    supports_early_stopping = True
+    model_file_extension = ".txt"
+
+    def save_model(self, model, path) -> None:
+        # Keeps the best iteration only when early stopping set one, the same trees predict uses
+        model.save_model(path)
+
+    def load_model(self, path):
+        return lgb.Booster(model_file=path)
+
+    def fit(self, hyperparameters, train, selected_feature_sets, sweep, num_threads=None):
+        """
+        The binned lightgbm.Dataset is shared by every grid row that uses the same
+        training data and bin parameters, so the feature matrix is only binned once.
+        With early stopping the Dataset holds only the fit rows, and training stops once
+        the mean per-era correlation on the holdout eras has not improved for the
+        requested number of rounds; the booster then predicts with its best iteration.
+        """
+        params, num_boost_round = lightgbm_train_params(hyperparameters)
+        if num_threads:
+            params["num_threads"] = num_threads
+        callbacks = [lightgbm_cancel_callback(sweep.cancel_event)]
+        if sweep.early_stopping is None:
+            train_set = sweep.lightgbm_dataset_cache.dataset(
+                sweep.training_data_key, params,
+                lambda: (train[selected_feature_sets], train["target"]),
+                binary_folder=sweep.cache_folder_path("lightgbm_datasets"),
+                save_binary=sweep.settings["save_lightgbm_binary"]
+            )
+
+            # Train the model using the provided features and target data
+            return lgb.train(params, train_set, num_boost_round=num_boost_round, callbacks=callbacks)
+
+        train_set = sweep.lightgbm_dataset_cache.dataset(
+            sweep.early_stopping.fit_key(sweep.training_data_key), params,
+            lambda: sweep.early_stopping.fit_data(train[selected_feature_sets], train["target"]),
+            binary_folder=sweep.cache_folder_path("lightgbm_datasets"),
+            save_binary=sweep.settings["save_lightgbm_binary"]
+        )
+        model = sweep.early_stopping.train(
+            params, train_set, num_boost_round,
+            lambda: (train[selected_feature_sets], train["target"]), callbacks=callbacks
+        )
+        print(f"Early stopping kept {model.best_iteration} of {num_boost_round} trees for {hyperparameters}")
+        return model
+
+    def predict(self, model, features) -> np.ndarray:
+        # A float32 array skips the pandas conversion done by Booster.predict for every batch
+        return model.predict(features.to_numpy(dtype=np.float32))
+
+    def truncate(self, model, tree_count):
+        if tree_count >= model.current_iteration():
+            return model
+        return lgb.Booster(model_str=model.model_to_string(num_iteration=tree_count))
+
+    def staged_predict(self, model, features, tree_counts) -> np.ndarray:
+        """
+        For objectives without a link function the trees are walked once: the raw scores of
+        the trees between consecutive counts are added to a running sum, so predicting every
+        count costs the same as predicting the largest one.
+        """
+        if model.params.get("objective", "regression") not in LIGHTGBM_IDENTITY_OBJECTIVES:
+            return super().staged_predict(model, features, tree_counts)
+
+        features = features.to_numpy(dtype=np.float32)
+        running = np.zeros(len(features))
+        previous_count = 0
+        staged = {}
+        for count in sorted(set(tree_counts)):
+            running += model.predict(features, start_iteration=previous_count, num_iteration=count - previous_count, raw_score=True)
+            staged[count] = running.copy()
+            previous_count = count
+        return np.column_stack([staged[count] for count in tree_counts])
+
+class HistGradientBoostingBackend(EstimatorBackend):
+    name = "HistGradientBoostingRegressor"
+    tree_count_key = "max_iter"
+    hyperparameter_schema = (
+        ("learning_rate", "Learning Rate",
+         "Please input float values like 0.01. For multiple values, separate them with commas like 0.01, 0.02", float),
+        ("max_iter", "Max Number of Trees",
+         "Please input Integer values like 2000. For multiple values, separate them with commas like 2000, 3000", int),
+        ("max_leaf_nodes", "Max Num of leaves per Tree",
+         "Please input Integer values like 31. For multiple values, separate them with commas like 30, 31", parse_integer_expression),
+        ("max_depth", "Max Depth of Tree",
+         "Please input Integer values like 5. For multiple values, separate them with commas like 5, 6", int),
+        ("max_features", "Proportion of random chosen features in each node split",
+         "Please input float values like 0.1. For multiple values, separate them with commas like 0.1, 0.2", float),
+    )
+
+    def available(self) -> bool:
+        return HistGradientBoostingRegressor is not None
+
+    def fit(self, hyperparameters, train, selected_feature_sets, sweep, num_threads=None):
+        # Early stopping on a random split of the rows would leak across eras, so it is turned off.
+        # A fixed seed keeps the feature subsampling of max_features repeatable like LightGBM's.
+        model = HistGradientBoostingRegressor(early_stopping=False, **{"random_state": 0, **hyperparameters})
+        # HistGradientBoostingRegressor threads are OpenMP threads, limited through threadpoolctl
+        with threadpool_limits(limits=num_threads, user_api="openmp"):
+            model.fit(train[selected_feature_sets], train["target"])
+        return model
+
+    def predict(self, model, features) -> np.ndarray:
+        return model.predict(features)
+
+    def truncate(self, model, tree_count):
+        if tree_count >= model.n_iter_:
+            return model
+        # n_iter_ is derived from the fitted predictors, one list of trees per iteration
+        truncated = copy.copy(model)
+        truncated._predictors = model._predictors[:tree_count]
+        return truncated
+
+    def staged_predict(self, model, features, tree_counts) -> np.ndarray:
+        # staged_predict adds one iteration at a time, so every count is read from a single pass
+        wanted = set(tree_counts)
+        staged = {}
+        for iteration, predictions in enumerate(model.staged_predict(features), start=1):
+            if iteration in wanted:
+                staged[iteration] = predictions
+        # Counts above the number of fitted iterations use the full model
+        final_predictions = predictions
+        return np.column_stack([staged.get(count, final_predictions) for count in tree_counts])
+
+class XGBoostBackend(EstimatorBackend):
+    name = "XGBRegressor"
+    tree_count_key = "n_estimators"
+    hyperparameter_schema = (
+        ("n_estimators", "Number of boosted trees to fit",
+         "Please input Integer values like 2000. For multiple values, separate them with commas like 2000, 3000", int),
+        ("learning_rate", "Boosting learning rate",
+         "Please input float values like 0.01. For multiple values, separate them with commas like 0.01, 0.02", float),
+        ("max_depth", "Maximum tree depth for base learners",
+         "Please input Integer values like 5. For multiple values, separate them with commas like 5, 6", int),
+        ("max_leaves", "Maximum tree leaves for base learners, 0 for no limit",
+         "Please input Integer values like 30. For multiple values, separate them with commas like 30, 31", parse_integer_expression),
+        ("colsample_bytree", "Subsample ratio of columns when constructing each tree",
+         "Please input float values like 0.1. For multiple values, separate them with commas like 0.1, 0.25", float),
+    )
+
+    model_file_extension = ".json"
+
+    def available(self) -> bool:
+        return xgb is not None
+
+    def save_model(self, model, path) -> None:
+        model.save_model(path)
+
+    def load_model(self, path):
+        model = xgb.XGBRegressor()
+        model.load_model(path)
+        return model
+
+    def fit(self, hyperparameters, train, selected_feature_sets, sweep, num_threads=None):
+        model = xgb.XGBRegressor(tree_method="hist", n_jobs=num_threads, **hyperparameters)
+        model.fit(train[selected_feature_sets], train["target"])
+        return model
+
+    def predict(self, model, features) -> np.ndarray:
+        # inplace_predict skips building a DMatrix for every batch
+        return model.get_booster().inplace_predict(features.to_numpy(dtype=np.float32))
+
+    def truncate(self, model, tree_count):
+        truncated = copy.copy(model)
+        truncated._Booster = model.get_booster()[:tree_count]
+        truncated.n_estimators = tree_count
+        return truncated
+
+    def staged_predict(self, model, features, tree_counts) -> np.ndarray:
+        features = features.to_numpy(dtype=np.float32)
+        booster = model.get_booster()
+        return np.column_stack([booster.inplace_predict(features, iteration_range=(0, count)) for count in tree_counts])
+
+class CatBoostBackend(EstimatorBackend):
+    name = "CatBoostRegressor"
+    tree_count_key = "iterations"
+    hyperparameter_schema = (
+        ("iterations", "Number of boosted trees to fit",
+         "Please input Integer values like 2000. For multiple values, separate them with commas like 2000, 3000", int),
+        ("learning_rate", "Boosting learning rate",
+         "Please input float values like 0.01. For multiple values, separate them with commas like 0.01, 0.02", float),
+        ("depth", "Depth of the symmetric trees",
+         "Please input Integer values like 6. For multiple values, separate them with commas like 6, 8", int),
+        ("rsm", "Subsample ratio of features at each split",
+         "Please input float values like 0.1. For multiple values, separate them with commas like 0.1, 0.25", float),
+        ("l2_leaf_reg", "L2 regularization of the leaf values",
+         "Please input float values like 3. For multiple values, separate them with commas like 3, 10", float),
+    )
+
+    model_file_extension = ".cbm"
+
+    def available(self) -> bool:
+        return catboost is not None
+
+    def save_model(self, model, path) -> None:
+        model.save_model(path)
+
+    def load_model(self, path):
+        return catboost.CatBoostRegressor().load_model(path)
+
+    def fit(self, hyperparameters, train, selected_feature_sets, sweep, num_threads=None):
+        model = catboost.CatBoostRegressor(thread_count=num_threads or -1, verbose=False, **hyperparameters)
+        model.fit(train[selected_feature_sets], train["target"])
+        return model
+
+    def truncate(self, model, tree_count):
+        if tree_count >= model.tree_count_:
+            return model
+        truncated = model.copy()
+        truncated.shrink(ntree_end=tree_count)
+        return truncated
+
+    def staged_predict(self, model, features, tree_counts) -> np.ndarray:
+        return np.column_stack([model.predict(features, ntree_end=count) for count in tree_counts])
+
+# Training methods offered on the Train page, in the order they are listed
+ESTIMATOR_BACKENDS = {
+    backend.name: backend
+    for backend in (LightGBMBackend(), HistGradientBoostingBackend(), XGBoostBackend(), CatBoostBackend())
+}
+# Hyperparameter columns of the results table, the same for every training method
+RESULT_HYPERPARAMETER_COLUMNS = list(dict.fromkeys(
+    key for backend in ESTIMATOR_BACKENDS.values() for key, _, _, _ in backend.hyperparameter_schema
+))
+
+def available_estimator_backends() -> list:
+    return [backend for backend in ESTIMATOR_BACKENDS.values() if backend.available()]
+
+# State of a parallel sweep worker process, set once by initialize_sweep_worker
+SWEEP_WORKER_STATE = {}
+
+def initialize_sweep_worker(features_path, target_path, feature_names, training_data_key, binary_folder, cancel_event=None, early_stopping=None):
+    """
+    Attaches a worker process to the memory-mapped training matrix, cancel event and
+    early stopping holdout shared by the sweep.
+    """
+    SWEEP_WORKER_STATE.update(
+        features=np.load(features_path, mmap_mode="r"),
+        target=np.load(target_path, mmap_mode="r"),
+        feature_names=feature_names,
+        training_data_key=training_data_key,
+        binary_folder=binary_folder,
+        dataset_cache=LightGBMDatasetCache(),
+        cancel_event=cancel_event,
+        early_stopping=early_stopping
+    )
+
+def train_lightgbm_in_worker(hyperparameters, num_threads):
+    """
+    Trains one grid row in a worker process and returns the model as a LightGBM model string,
+    its best iteration (0 without early stopping) and the fit time in seconds.
+    """
+    fit_start = time.perf_counter()
+    params, num_boost_round = lightgbm_train_params(hyperparameters)
+    params["num_threads"] = num_threads
+    callbacks = []
+    if SWEEP_WORKER_STATE["cancel_event"] is not None:
+        callbacks.append(lightgbm_cancel_callback(SWEEP_WORKER_STATE["cancel_event"]))
+
+    early_stopping = SWEEP_WORKER_STATE["early_stopping"]
+    if early_stopping is None:
+        train_set = SWEEP_WORKER_STATE["dataset_cache"].dataset(
+            SWEEP_WORKER_STATE["training_data_key"], params,
+            lambda: (SWEEP_WORKER_STATE["features"], SWEEP_WORKER_STATE["target"]),
+            binary_folder=SWEEP_WORKER_STATE["binary_folder"],
+            feature_name=SWEEP_WORKER_STATE["feature_names"]
+        )
+        model = lgb.train(params, train_set, num_boost_round=num_boost_round, callbacks=callbacks)
+        return model.model_to_string(), 0, time.perf_counter() - fit_start
+
+    train_set = SWEEP_WORKER_STATE["dataset_cache"].dataset(
+        early_stopping.fit_key(SWEEP_WORKER_STATE["training_data_key"]), params,
+        lambda: early_stopping.fit_data(SWEEP_WORKER_STATE["features"], SWEEP_WORKER_STATE["target"]),
+        binary_folder=SWEEP_WORKER_STATE["binary_folder"],
+        feature_name=SWEEP_WORKER_STATE["feature_names"]
+    )
+    model = early_stopping.train(
+        params, train_set, num_boost_round,
+        lambda: (SWEEP_WORKER_STATE["features"], SWEEP_WORKER_STATE["target"]), callbacks=callbacks
+    )
+    # The saved model string ends at the best iteration
+    return model.model_to_string(), model.best_iteration, time.perf_counter() - fit_start
+
+class ParallelSweepExecutor:
+    """
+    Trains the rows of a LightGBM hyperparameter grid across a pool of worker processes.
+
+    The training matrix is written once to a memory-mapped float32 file which every worker
+    attaches to read-only, so the operating system shares the pages instead of each worker
+    holding a copy. Each worker bins the data once for all of its rows, or loads the saved
+    binary Dataset when one exists, and LightGBM threads are limited so that
+    workers x threads matches the number of cores.
+    """
+    def __init__(self, workers, shared_folder):
+        self.workers = workers
+        self.shared_folder = shared_folder
+
+    def share_training_matrix(self, training_data_key, train, selected_feature_sets, chunk_size=PREDICTION_BATCH_SIZE):
+        os.makedirs(self.shared_folder, exist_ok=True)
+        features_path = os.path.join(self.shared_folder, f"{training_data_key}_features.npy")
+        target_path = os.path.join(self.shared_folder, f"{training_data_key}_target.npy")
+
+        # Fill the memory-mapped file in row chunks so no full-size temporary copy is created
+        features = np.lib.format.open_memmap(features_path, mode="w+", dtype=np.float32, shape=(len(train), len(selected_feature_sets)))
+        for start in range(0, len(train), chunk_size):
+            stop = min(start + chunk_size, len(train))
+            features[start:stop] = train.iloc[start:stop][selected_feature_sets].to_numpy(dtype=np.float32)
+        features.flush()
+        del features
+        np.save(target_path, train["target"].to_numpy(dtype=np.float32))
+        return features_path, target_path
+
+    def iter_train_lightgbm(self, training_data_key, train, selected_feature_sets, hyperparameter_rows, binary_folder=None, cancel_event=None, early_stopping=None):
+        """
+        Trains every row of the grid, yielding (row index, lightgbm.Booster, fit seconds) as
+        each model finishes. Rows that fail are reported and skipped. Setting cancel_event stops the
+        running models at their next iteration and raises SweepCancelled, and rows that
+        have not started yet are dropped.
+        """
+        features_path, target_path = self.share_training_matrix(training_data_key, train, selected_feature_sets)
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers)
+        print(f"Training {len(hyperparameter_rows)} models on {self.workers} processes with {threads_per_worker} threads each")
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initialize_sweep_worker,
+                initargs=(features_path, target_path, selected_feature_sets, training_data_key, binary_folder, cancel_event, early_stopping)
+            ) as pool:
+                futures = {
+                    pool.submit(train_lightgbm_in_worker, hyperparameters, threads_per_worker): i
+                    for i, hyperparameters in enumerate(hyperparameter_rows)
+                }
+                try:
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        try:
+                            model_string, best_iteration, fit_seconds = future.result()
+                            model = lgb.Booster(model_str=model_string)
+                            model.best_iteration = best_iteration
+                        except SweepCancelled:
+                            raise
+                        except Exception as e:
+                            print(f"Error training model with hyperparameters {hyperparameter_rows[i]}: {e}")
+                            continue
+                        yield i, model, fit_seconds
+                finally:
+                    # Drop the rows still queued when the sweep stops early
+                    for future in futures:
+                        future.cancel()
+        finally:
+            for path in (features_path, target_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+class LightGBMDatasetCache:
+    """
+    Constructed lightgbm.Dataset objects reused across grid rows and sweeps.
+
+    Datasets are keyed by the prepared training data key and the bin-related parameters,
+    so rows that only change tree or learning parameters skip binning. A Dataset can be
+    saved with save_binary, and later sessions load that binary file instead of binning
+    the feature matrix again.
+    """
+    def __init__(self):
+        self.datasets = {}
+
+    def dataset(self, training_data_key, params, features_and_label, binary_folder=None, save_binary=False, feature_name="auto"):
+        """
+        Returns the constructed Dataset for the training data and the bin parameters in params.
+        features_and_label is only called when the Dataset has to be built from raw data.
+        """
+        bin_params = {name: params[name] for name in LIGHTGBM_BIN_PARAMETERS if name in params}
+        bin_digest = hashlib.sha1(json.dumps(bin_params, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:8]
+        dataset_key = (training_data_key, bin_digest)
+        if training_data_key is not None and dataset_key in self.datasets:
+            return self.datasets[dataset_key]
+
+        binary_path = os.path.join(binary_folder, f"{training_data_key}_{bin_digest}.bin") if binary_folder and training_data_key else None
+        if binary_path and os.path.exists(binary_path):
+            print(f"Loading binned LightGBM training data from {binary_path}")
+            train_set = lgb.Dataset(binary_path, params=bin_params)
+        else:
+            features, label = features_and_label()
+            train_set = lgb.Dataset(features, label=label, params=bin_params, feature_name=feature_name)
+        train_set.construct()
+
+        if save_binary and binary_path and not os.path.exists(binary_path):
+            os.makedirs(binary_folder, exist_ok=True)
+            train_set.save_binary(binary_path)
+            print(f"Saved binned LightGBM training data to {binary_path}")
+
+        if training_data_key is not None:
+            # Datasets binned from other training data are not reused once the training data changes
+            self.datasets = {key: value for key, value in self.datasets.items() if key[0] == training_data_key}
+            self.datasets[dataset_key] = train_set
+        return train_set
+
+class PreparedFrameCache:
+    """
+    On-disk cache of prepared training frames stored as uncompressed Arrow IPC (Feather) files.
+
+    Entries are keyed by the source file identity (path, size and modification time), the
+    feature set and the loading options. Loads are memory-mapped, so numeric columns are read
+    without copying, and the least recently used entries are evicted once the folder grows
+    beyond max_bytes.
+    """
+    def __init__(self, cache_folder, max_bytes=PREPARED_FRAME_CACHE_MAX_BYTES):
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+
+    def key(self, full_file_path, feature_set_name, columns, **options) -> str:
+        file_stat = os.stat(full_file_path)
+        identity = {
+            "path": os.path.abspath(full_file_path),
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime_ns,
+            "feature_set": feature_set_name,
+            "columns": columns,
+            "options": options,
         }
+        digest = hashlib.sha1(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        return f"{os.path.splitext(os.path.basename(full_file_path))[0]}_{feature_set_name}_{digest}"
 
-        if len(set(lengths.values())) != 1:
-            QMessageBox.warning(self, "Input Error", "Number of values for each hyperparameter must be equal.")
-            return None
+    def path(self, key) -> str:
+        return os.path.join(self.cache_folder, f"{key}.arrow")
 
+    def load(self, key):
+        cache_path = self.path(key)
+        if not os.path.exists(cache_path):
+            return None
         try:
-            # Create hyperparameters grid based on user input
-            hyperparameters_grid = {
-                'n_estimators': [int(value) for value in n_estimators_values],
-                'learning_rate': [float(value) for value in learning_rate_values],
-                'max_depth': [int(value) for value in max_depth_values],
-                'num_leaves': [int(eval(value)) for value in num_leaves_values],
-                'colsample_bytree': [float(value) for value in colsample_bytree_values if value.strip()]
-            }
-        except ValueError as ve:
-            QMessageBox.warning(self, "Input Error", f"ValueError: {ve}")
+            table = pa.ipc.open_file(pa.memory_map(cache_path, "r")).read_all()
+            # Refresh the modification time so eviction keeps recently used entries
+            os.utime(cache_path)
+            return table.to_pandas(split_blocks=True)
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"Ignoring unreadable cache entry {cache_path}: {e}")
             return None
-        except (TypeError, NameError, SyntaxError) as e:
-            QMessageBox.warning(self, "Input Error", f"Error evaluating values: {e}")
+
+    def store(self, key, frame) -> None:
+        os.makedirs(self.cache_folder, exist_ok=True)
+        cache_path = self.path(key)
+        temporary_path = f"{cache_path}.tmp"
+        try:
+            feather.write_feather(frame, temporary_path, compression="uncompressed")
+            os.replace(temporary_path, cache_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Could not write cache entry {cache_path}: {e}")
+            return
+        self.evict(keep=cache_path)
+
+    def evict(self, keep=None) -> None:
+        entries = []
+        for file in os.listdir(self.cache_folder):
+            if file.endswith(".arrow"):
+                cache_path = os.path.join(self.cache_folder, file)
+                file_stat = os.stat(cache_path)
+                entries.append((file_stat.st_mtime, file_stat.st_size, cache_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, cache_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if cache_path == keep:
+                continue
+            try:
+                os.remove(cache_path)
+                total_bytes -= size
+                print(f"Evicted cache entry {cache_path}")
+            except OSError:
+                # Still memory-mapped by a loaded frame, try again on the next store
+                continue
+
+class TrainedModelCache:
+    """
+    On-disk cache of fitted sweep rows: the model, its float32 validation predictions and
+    its scores, stored as one cloudpickle file per row.
+
+    Entries are content addressed: the key is a digest of the training and validation file
+    identities (path, size and modification time), the features, the loading and early
+    stopping settings, the training method and the hyperparameters, seeds included. Rerunning
+    a row with the same key skips its fit and prediction. The least recently used entries
+    are evicted once the folder grows beyond max_bytes.
+    """
+    def __init__(self, cache_folder, max_bytes=TRAINED_MODEL_CACHE_MAX_BYTES):
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+
+    def key(self, training_identity, method, hyperparameters) -> str:
+        identity = {"training": training_identity, "method": method, "hyperparameters": hyperparameters}
+        return hashlib.sha1(json.dumps(identity, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def path(self, key) -> str:
+        return os.path.join(self.cache_folder, f"{key}.pkl")
+
+    def load(self, key):
+        cache_path = self.path(key)
+        if not os.path.exists(cache_path):
             return None
+        try:
+            with open(cache_path, "rb") as file:
+                entry = cloudpickle.load(file)
+            # Refresh the modification time so eviction keeps recently used entries
+            os.utime(cache_path)
+            return entry
         except Exception as e:
-            QMessageBox.warning(self, "Unexpected Error", f"Unexpected error: {e}")
+            print(f"Ignoring unreadable trained model cache entry {cache_path}: {e}")
             return None
 
-        # Clear the input fields
-        self.n_estimators.clear()
-        self.learning_rate.clear()
-        self.max_depth.clear()
-        self.num_leaves.clear()
-        self.colsample_bytree.clear()
+    def store(self, key, entry) -> None:
+        os.makedirs(self.cache_folder, exist_ok=True)
+        cache_path = self.path(key)
+        temporary_path = f"{cache_path}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                cloudpickle.dump(entry, file)
+            os.replace(temporary_path, cache_path)
+        except Exception as e:
+            print(f"Could not write trained model cache entry {cache_path}: {e}")
+            return
+        self.evict(keep=cache_path)
+
+    def evict(self, keep=None) -> None:
+        entries = []
+        for file in os.listdir(self.cache_folder):
+            if file.endswith(".pkl"):
+                cache_path = os.path.join(self.cache_folder, file)
+                file_stat = os.stat(cache_path)
+                entries.append((file_stat.st_mtime, file_stat.st_size, cache_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, cache_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if cache_path == keep:
+                continue
+            try:
+                os.remove(cache_path)
+                total_bytes -= size
+                print(f"Evicted trained model cache entry {cache_path}")
+            except OSError:
+                continue
+
+def predict_in_batches(model, features, selected_feature_sets, batch_size=PREDICTION_BATCH_SIZE, backend=None):
+    """
+    Predicts a DataFrame batch_size rows at a time into a preallocated float32 array,
+    so only one batch of the selected feature columns is copied at any moment. With a
+    backend its fast predict path is used instead of model.predict.
+    """
+    predict = model.predict if backend is None else lambda batch: backend.predict(model, batch)
+    predictions = np.empty(len(features), dtype=np.float32)
+    for start in range(0, len(features), batch_size):
+        stop = min(start + batch_size, len(features))
+        predictions[start:stop] = predict(features.iloc[start:stop][selected_feature_sets])
+    return predictions
+
+def predict_staged_in_batches(model, features, selected_feature_sets, tree_counts, backend, batch_size=PREDICTION_BATCH_SIZE):
+    """
+    Predicts a DataFrame with the first tree_counts[k] trees of a model for every k,
+    returning a float32 array with one column per tree count.
+    """
+    predictions = np.empty((len(features), len(tree_counts)), dtype=np.float32)
+    for start in range(0, len(features), batch_size):
+        stop = min(start + batch_size, len(features))
+        predictions[start:stop] = backend.staged_predict(model, features.iloc[start:stop][selected_feature_sets], tree_counts)
+    return predictions
+
+def predict_parquet_in_batches(model, full_file_path, selected_feature_sets, batch_size=PREDICTION_BATCH_SIZE, filter_expression=None):
+    """
+    Streams the record batches of a parquet file through the model without loading the file,
+    returning the float32 predictions and the matching index.
+    """
+    dataset = ds.dataset(full_file_path, format="parquet")
+    index_columns = [name for name in (dataset.schema.pandas_metadata or {}).get("index_columns", []) if isinstance(name, str)]
+
+    predictions = np.empty(dataset.count_rows(filter=filter_expression), dtype=np.float32)
+    index_values = []
+    offset = 0
+    for batch in dataset.to_batches(columns=selected_feature_sets + index_columns, filter=filter_expression, batch_size=batch_size):
+        features = batch.to_pandas()
+        predictions[offset:offset + len(features)] = model.predict(features[selected_feature_sets])
+        index_values.append(features.index)
+        offset += len(features)
+
+    index = index_values[0].append(index_values[1:]) if index_values else pd.RangeIndex(0)
+    return predictions, index
 
-        return hyperparameters_grid                                       
-           
 class ModelWithPredictMethod:
-    def __init__(self, trained_model, selected_feature_sets_all_features):
+    def __init__(self, trained_model, selected_feature_sets_all_features, batch_size=PREDICTION_BATCH_SIZE):
         self.trained_model = trained_model
         self.selected_feature_sets_all_features = selected_feature_sets_all_features
+        self.batch_size = batch_size
 
-    def predict(self, live_features: pd.DataFrame) -> pd.DataFrame:
-        live_predictions = self.trained_model.predict(live_features[self.selected_feature_sets_all_features])
-        submission = pd.Series(live_predictions, index=live_features.index)
+    def predict(self, live_features) -> pd.DataFrame:
+        """
+        Predicts a live features DataFrame, or the path of a parquet file which is then
+        streamed batch by batch so the file never has to fit in memory.
+        """
+        if isinstance(live_features, str):
+            live_predictions, index = predict_parquet_in_batches(
+                self.trained_model, live_features, self.selected_feature_sets_all_features, self.batch_size
+            )
+        else:
+            live_predictions = predict_in_batches(
+                self.trained_model, live_features, self.selected_feature_sets_all_features, self.batch_size
+            )
+            index = live_features.index
+        submission = pd.Series(live_predictions, index=index)
         return submission.to_frame("prediction")
                  
-class StdoutRedirector:
+class NativeModelPredictor:
+    """
+    Lean submission predictor holding only a LightGBM model text and its feature names.
+
+    Pickling stores the zlib compressed model text, so unpickling needs lightgbm, numpy
+    and pandas but none of the sklearn wrappers or helpers of this module. The Booster is
+    rebuilt from the text when unpickled, and each batch of features is copied straight
+    into a float32 matrix for Booster.predict.
+    """
+    def __init__(self, model_text, feature_names, batch_size=PREDICTION_BATCH_SIZE):
+        self.model_text = model_text
+        self.feature_names = list(feature_names)
+        self.batch_size = batch_size
+        self.booster = lgb.Booster(model_str=model_text)
+
+    def __getstate__(self):
+        return {
+            "model_text": zlib.compress(self.model_text.encode("utf-8")),
+            "feature_names": self.feature_names,
+            "batch_size": self.batch_size,
+        }
+
+    def __setstate__(self, state):
+        self.model_text = zlib.decompress(state["model_text"]).decode("utf-8")
+        self.feature_names = state["feature_names"]
+        self.batch_size = state["batch_size"]
+        self.booster = lgb.Booster(model_str=self.model_text)
+
+    def predict(self, live_features) -> pd.DataFrame:
+        predictions = np.empty(len(live_features))
+        for start in range(0, len(live_features), self.batch_size):
+            batch = live_features.iloc[start:start + self.batch_size][self.feature_names]
+            predictions[start:start + len(batch)] = self.booster.predict(batch.to_numpy(dtype=np.float32))
+        return pd.DataFrame({"prediction": predictions}, index=live_features.index)
+
+def export_native_lightgbm_model(model, feature_names, pickle_path) -> list:
+    """
+    Writes a LightGBM model as its native text file, a JSON manifest of the feature columns
+    and a pickled NativeModelPredictor.predict for submission, all next to pickle_path.
+
+    Args:
+        model (lgb.Booster): Trained model. Only its best iteration is kept when early
+            stopping set one.
+        feature_names (list): Feature columns in the order the model was trained on.
+        pickle_path (str): Path of the predict pickle, the other files share its stem.
+
+    Returns:
+        list: Paths of the written files.
+    """
+    stem = os.path.splitext(pickle_path)[0]
+    model_path = f"{stem}.txt"
+    manifest_path = f"{stem}_features.json"
+    model_text = model.model_to_string()
+    with open(model_path, "w") as file:
+        file.write(model_text)
+    with open(manifest_path, "w") as file:
+        json.dump({"features": list(feature_names), "dtype": "float32", "model_file": os.path.basename(model_path)}, file, indent=2)
+    with open(pickle_path, "wb") as file:
+        cloudpickle.dump(NativeModelPredictor(model_text, feature_names).predict, file)
+    return [pickle_path, model_path, manifest_path]
+
+class ValidationContext:
+    """
+    Validation rows shared by every model of a sweep. The features are loaded,
+    filtered and embargoed once; each model only adds its own prediction column.
+    """
+    def __init__(self, validation, selected_feature_sets, prediction_batch_size=PREDICTION_BATCH_SIZE, backend=None):
+        self.validation = validation
+        self.selected_feature_sets = selected_feature_sets
+        self.prediction_batch_size = prediction_batch_size
+        self.backend = backend
+        self.meta_model = None
+        self.meta_model_key = None
+        self.scoring = None
+
+    def aligned_meta_model(self, full_file_path) -> pd.Series:
+        """
+        Returns the numerai_meta_model column aligned to the validation ids.
+
+        Only that column and the id index are read, and the aligned series is kept until
+        the meta model file is modified. A new meta model only rebuilds the meta model
+        side of the scoring context.
+        """
+        file_stat = os.stat(full_file_path)
+        meta_model_key = (os.path.abspath(full_file_path), file_stat.st_size, file_stat.st_mtime_ns)
+        if self.meta_model_key != meta_model_key:
+            if "numerai_meta_model" not in ds.dataset(full_file_path, format="parquet").schema.names:
+                raise KeyError("numerai_meta_model")
+            meta_model_data = pd.read_parquet(full_file_path, columns=["numerai_meta_model"])["numerai_meta_model"]
+            self.meta_model = meta_model_data.reindex(self.validation.index)
+            self.meta_model_key = meta_model_key
+            if self.scoring is not None:
+                self.scoring.set_meta_model(self.meta_model.to_numpy())
+        return self.meta_model
+
+    def scoring_context(self) -> ScoringContext:
+        """
+        Returns the ScoringContext of the validation rows, built on first use with the
+        meta model loaded by aligned_meta_model, if any.
+        """
+        if self.scoring is None:
+            self.scoring = ScoringContext(
+                self.validation["era"].to_numpy(), self.validation["target"].to_numpy(),
+                None if self.meta_model is None else self.meta_model.to_numpy(), self.validation.index
+            )
+        return self.scoring
+
+    def frame_with_predictions(self, model) -> pd.DataFrame:
+        validation = self.validation[["era", "target"]].copy()
+        validation["prediction"] = predict_in_batches(
+            model, self.validation, self.selected_feature_sets, self.prediction_batch_size, self.backend
+        )
+        return validation
+
+    def frames_with_staged_predictions(self, model, tree_counts=None) -> list:
+        """
+        Returns one era/target/prediction frame per tree count, predicted from the first
+        tree_counts[k] trees of a single model of the context's backend. Without tree counts the model
+        predicts with all of its trees (or its best iteration) as frame_with_predictions.
+        """
+        if not tree_counts:
+            return [self.frame_with_predictions(model)]
+
+        staged_predictions = predict_staged_in_batches(
+            model, self.validation, self.selected_feature_sets, tree_counts, self.backend, self.prediction_batch_size
+        )
+        validations = []
+        for k in range(len(tree_counts)):
+            validation = self.validation[["era", "target"]].copy()
+            validation["prediction"] = staged_predictions[:, k]
+            validations.append(validation)
+        return validations
+
+class ModelResult:
+    """
+    Compact record of one scored sweep row, as kept in Platform.trained_models.
+
+    It holds the result table row, the model, its float32 validation predictions and the
+    per-era CORR and MMC series. The validation ids, eras, target and meta model are not
+    copied per model: every record of a sweep refers to the same ScoringContext.
+    """
+    def __init__(self, results_df, model, hyperparameters, predictions, per_era_corr, per_era_mmc, scoring_context, selected_feature_sets):
+        self.results_df = results_df
+        self.fitted_model = model
+        self.model_pool = None
+        self.model_key = None
+        self.hyperparameters = hyperparameters
+        self.predictions = np.asarray(predictions, dtype=np.float32)
+        self.per_era_corr = per_era_corr.rename("prediction")
+        self.per_era_mmc = per_era_mmc.rename("prediction")
+        self.scoring_context = scoring_context
+        self.selected_feature_sets = selected_feature_sets
+        self.result_id = None
+
+    @property
+    def model(self):
+        """
+        The fitted model, reloaded from disk by the model pool when it was spilled.
+        """
+        if self.model_pool is None:
+            return self.fitted_model
+        return self.model_pool.get(self.model_key)
+
+    def move_to_model_pool(self, model_pool, key) -> None:
+        """
+        Hands the model over to model_pool, which may spill it to disk from then on.
+
+        Args:
+            model_pool (ModelPool): Pool of the session's trained models.
+            key: Key of the model in the pool, the model number of the results table.
+        """
+        backend = ESTIMATOR_BACKENDS[self.results_df["method"].iloc[0]]
+        model_pool.add(key, self.fitted_model, backend)
+        self.model_pool, self.model_key, self.fitted_model = model_pool, key, None
+
+    def set_scores(self, per_era_corr, per_era_mmc, summary):
+        """
+        Replaces the per-era series and the score columns of the result row after re-scoring.
+
+        Args:
+            per_era_corr (pd.Series): New per-era CORR.
+            per_era_mmc (pd.Series): New per-era MMC.
+            summary (pd.Series): New RESULT_SCORE_COLUMNS statistics.
+        """
+        self.per_era_corr = per_era_corr.rename("prediction")
+        self.per_era_mmc = per_era_mmc.rename("prediction")
+        self.results_df = self.results_df.copy()
+        for column in RESULT_SCORE_COLUMNS:
+            self.results_df[column] = [summary[column]]
+
+    def validation_frame(self) -> pd.DataFrame:
+        """
+        Returns the era, prediction, target and meta_model columns of the validation rows,
+        built from the shared scoring context when needed.
+        """
+        scoring_context = self.scoring_context
+        frame = pd.DataFrame(
+            {"era": scoring_context.eras, "prediction": self.predictions, "target": scoring_context.target},
+            index=scoring_context.index
+        )
+        if scoring_context.meta_model is not None:
+            frame["meta_model"] = scoring_context.meta_model
+        return frame
+
+class ModelPool:
+    """
+    Trained models of the session, at most max_models of them or max_bytes of model files
+    held in memory.
+
+    A model is written to the spill folder in its backend's native format as soon as it is
+    added, so evicting the least recently used model only drops it from memory and the next
+    get reloads it from its file. The file size stands in for the model's memory size.
+    Evictions and reloads are printed with the hit, miss and eviction counts.
+    """
+    def __init__(self, max_models=MODEL_POOL_MAX_MODELS, max_bytes=MODEL_POOL_MAX_BYTES):
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        # Created on the first add and removed by close
+        self.spill_folder = None
+        # key -> model, least recently used first
+        self.models = OrderedDict()
+        # key -> (path, backend, size in bytes)
+        self.files = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def add(self, key, model, backend) -> None:
+        if self.spill_folder is None:
+            self.spill_folder = tempfile.mkdtemp(prefix="numerai_models_")
+        path = os.path.join(self.spill_folder, f"model_{key}{backend.model_file_extension}")
+        backend.save_model(model, path)
+        self.files[key] = (path, backend, os.path.getsize(path))
+        self.models[key] = model
+        self.models.move_to_end(key)
+        self.evict(keep=key)
+
+    def get(self, key):
+        if key in self.models:
+            self.hits += 1
+            self.models.move_to_end(key)
+            return self.models[key]
+
+        self.misses += 1
+        path, backend, _ = self.files[key]
+        model = backend.load_model(path)
+        self.models[key] = model
+        print(f"Model pool: reloaded model {key} from disk ({self.counts()})")
+        self.evict(keep=key)
+        return model
+
+    def memory_bytes(self) -> int:
+        return sum(self.files[key][2] for key in self.models)
+
+    def evict(self, keep=None) -> None:
+        """
+        Drops the least recently used models from memory until both limits hold. The model
+        keep, which the caller is about to use, always stays.
+        """
+        while len(self.models) > 1 and (len(self.models) > self.max_models or self.memory_bytes() > self.max_bytes):
+            key = next(key for key in self.models if key != keep)
+            del self.models[key]
+            self.evictions += 1
+            print(f"Model pool: spilled model {key} to disk ({self.counts()})")
+
+    def counts(self) -> str:
+        return f"{len(self.models)} of {len(self.files)} in memory, {self.hits} hits, {self.misses} misses, {self.evictions} evictions"
+
+    def close(self) -> None:
+        if self.spill_folder is not None:
+            shutil.rmtree(self.spill_folder, ignore_errors=True)
+            self.spill_folder = None
+        self.models.clear()
+        self.files.clear()
+
+class ExperimentStore:
+    """
+    On-disk store of sweep results inside the EXPERIMENT_FOLDER_NAME folder of a dataset folder.
+
+    SQLite holds one row per sweep and one row per scored model with its hyperparameters and
+    summary scores, so results can be filtered, ordered and paged without reading anything
+    else. Parquet files hold the bulky parts: the validation ids, eras and target once per
+    sweep, and the per-era CORR/MMC series and float32 predictions of every result, which are
+    only read when a result is selected.
+
+    A connection belongs to the thread that opened the store, so the sweep worker and the
+    window each open their own.
+    """
+    def __init__(self, dataset_folder):
+        self.folder = os.path.join(dataset_folder, EXPERIMENT_FOLDER_NAME)
+        for sub_folder in ("validation", "per_era", "predictions"):
+            os.makedirs(os.path.join(self.folder, sub_folder), exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(self.folder, "experiments.sqlite"), timeout=30)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS sweeps (
+                sweep_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                method TEXT,
+                training_file TEXT,
+                validation_file TEXT,
+                meta_model_file TEXT,
+                feature_set_name TEXT,
+                era_stride INTEGER,
+                search_strategy TEXT
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sweep_id INTEGER NOT NULL REFERENCES sweeps(sweep_id),
+                created_at TEXT NOT NULL,
+                method TEXT,
+                hyperparameters TEXT,
+                best_iteration INTEGER,
+                shared_fit TEXT,
+                fit_seconds REAL,
+                {", ".join(f"{column} REAL" for column in RESULT_SCORE_COLUMNS)}
+            );
+            CREATE INDEX IF NOT EXISTS results_sweep ON results(sweep_id);
+        """)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def file_path(self, sub_folder, key) -> str:
+        return os.path.join(self.folder, sub_folder, f"{key}.parquet")
+
+    def start_sweep(self, settings, scoring_context) -> int:
+        """
+        Records a new sweep and writes the ids, eras and target of its validation rows.
+
+        Returns:
+            int: Id of the new sweep.
+        """
+        cursor = self.connection.execute(
+            "INSERT INTO sweeps (created_at, method, training_file, validation_file, meta_model_file, "
+            "feature_set_name, era_stride, search_strategy) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%d %H:%M:%S"), settings["selected_method"], settings["training_file"],
+             settings["validation_file"], settings["meta_model_file"], settings["feature_set_name"],
+             settings["era_stride"], settings["search_strategy"])
+        )
+        sweep_id = cursor.lastrowid
+        pd.DataFrame(
+            {"era": scoring_context.eras, "target": scoring_context.target}, index=scoring_context.index
+        ).to_parquet(self.file_path("validation", sweep_id))
+        self.connection.commit()
+        return sweep_id
+
+    def add_result(self, sweep_id, model_result) -> int:
+        """
+        Writes one scored model. Its row is only committed once its Parquet files are
+        written, so a stored row always has its files.
+
+        Returns:
+            int: Id of the new result.
+        """
+        results = model_result.results_df.iloc[0]
+        cursor = self.connection.execute(
+            f"INSERT INTO results (sweep_id, created_at, method, hyperparameters, best_iteration, shared_fit, fit_seconds, "
+            f"{', '.join(RESULT_SCORE_COLUMNS)}) VALUES ({', '.join('?' * (7 + len(RESULT_SCORE_COLUMNS)))})",
+            (sweep_id, time.strftime("%Y-%m-%d %H:%M:%S"), results["method"],
+             json.dumps(model_result.hyperparameters, default=str),
+             None if pd.isna(results["best_iteration"]) else int(results["best_iteration"]),
+             results["shared_fit"],
+             None if pd.isna(results["fit_seconds"]) else float(results["fit_seconds"]),
+             *[None if pd.isna(results[column]) else float(results[column]) for column in RESULT_SCORE_COLUMNS])
+        )
+        result_id = cursor.lastrowid
+        try:
+            pd.concat(
+                [model_result.per_era_corr.rename("corr"), model_result.per_era_mmc.rename("mmc")], axis=1
+            ).rename_axis("era").to_parquet(self.file_path("per_era", result_id))
+            pd.DataFrame({"prediction": model_result.predictions}).to_parquet(self.file_path("predictions", result_id))
+        except Exception:
+            self.connection.rollback()
+            raise
+        self.connection.commit()
+        return result_id
+
+    def query_results(self, method=None, min_corr_mean=None, min_mmc_mean=None, order_by="corr_mean", page=0, page_size=EXPERIMENT_PAGE_SIZE):
+        """
+        Returns one page of stored results matching the filters, best first.
+
+        Args:
+            method (str, optional): Only results of this training method.
+            min_corr_mean (float, optional): Only results with at least this mean CORR.
+            min_mmc_mean (float, optional): Only results with at least this mean MMC.
+            order_by (str): One of EXPERIMENT_ORDER_COLUMNS.
+            page (int): Page number, starting at 0.
+            page_size (int): Results per page.
+
+        Returns:
+            tuple: (page of results as a DataFrame, number of matching results).
+        """
+        if order_by not in EXPERIMENT_ORDER_COLUMNS:
+            raise ValueError(f"Results cannot be ordered by {order_by}.")
+        conditions, parameters = [], []
+        for condition, value in (("results.method = ?", method), ("corr_mean >= ?", min_corr_mean), ("mmc_mean >= ?", min_mmc_mean)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        total = self.connection.execute(f"SELECT COUNT(*) FROM results {where}", parameters).fetchone()[0]
+        page_results = pd.read_sql_query(
+            f"SELECT results.result_id, results.sweep_id, results.created_at, results.method, sweeps.training_file, "
+            f"sweeps.era_stride, results.hyperparameters, results.best_iteration, results.fit_seconds, "
+            f"{', '.join(RESULT_SCORE_COLUMNS)} FROM results JOIN sweeps ON sweeps.sweep_id = results.sweep_id {where} "
+            f"ORDER BY results.{order_by} DESC, results.result_id DESC LIMIT ? OFFSET ?",
+            self.connection, params=[*parameters, page_size, page * page_size]
+        )
+        return page_results, total
+
+    def methods(self) -> list:
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT method FROM results ORDER BY method")]
+
+    def load_per_era(self, result_id):
+        """
+        Returns the per-era CORR and MMC series of a stored result.
+        """
+        per_era = pd.read_parquet(self.file_path("per_era", result_id))
+        return per_era["corr"].dropna().rename("prediction"), per_era["mmc"].dropna().rename("prediction")
+
+    def load_validation_predictions(self, result_id) -> pd.DataFrame:
+        """
+        Returns the era, prediction and target of every validation row of a stored result.
+        """
+        sweep_id = self.connection.execute("SELECT sweep_id FROM results WHERE result_id = ?", (result_id,)).fetchone()[0]
+        validation = pd.read_parquet(self.file_path("validation", sweep_id))
+        validation["prediction"] = pd.read_parquet(self.file_path("predictions", result_id))["prediction"].to_numpy()
+        return validation[["era", "prediction", "target"]]
+
+class SweepCancelled(Exception):
+    """Raised inside a sweep, including from LightGBM callbacks, once the user cancels it."""
+
+def lightgbm_cancel_callback(cancel_event):
+    """
+    Returns a LightGBM callback that stops training at the next boosting iteration once
+    cancel_event is set.
+    """
+    def callback(env):
+        if cancel_event.is_set():
+            raise SweepCancelled("Training cancelled")
+    callback.order = 0
+    return callback
+
+class SweepWorker(QObject):
+    """
+    Runs the load -> fit -> predict -> score pipeline of a hyperparameter sweep off the GUI thread.
+
+    The worker only reads the settings captured from the widgets when the sweep started and
+    reports back through signals: stage progress, frames to show in the data tables, one
+    finished result row at a time and error messages. cancel() is safe to call from the GUI
+    thread and stops the sweep between models and inside LightGBM training, including in
+    the parallel worker processes, which share the same cancel event.
+    """
+    progress = Signal(str, int, int)
+    table_ready = Signal(object, str)
+    model_ready = Signal(object)
+    failed = Signal(str, str)
+    finished = Signal()
+
+    def __init__(self, sweep_settings, lightgbm_dataset_cache):
+        super().__init__()
+        self.settings = sweep_settings
+        self.lightgbm_dataset_cache = lightgbm_dataset_cache
+        self.cancel_event = multiprocessing.get_context("spawn").Event()
+        self.training_data_key = None
+        self.early_stopping = None
+        self.hyperparameter_rows = sweep_settings["hyperparameter_rows"]
+        self.backend = ESTIMATOR_BACKENDS[sweep_settings["selected_method"]]
+        self.experiment_store = None
+        self.sweep_id = None
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise SweepCancelled("Sweep cancelled")
+
+    def cache_folder_path(self, *sub_folders) -> str:
+        return os.path.join(self.settings["dataset_folder"], CACHE_FOLDER_NAME, *sub_folders)
+
+    def trained_model_identity(self) -> dict:
+        """
+        Everything besides the training method and hyperparameters that a fitted row and its
+        validation predictions depend on, used to key the trained model cache.
+        """
+        settings = self.settings
+        identity = {}
+        for file_setting in ("training_file", "validation_file"):
+            full_file_path = os.path.join(settings["dataset_folder"], settings[file_setting])
+            file_stat = os.stat(full_file_path)
+            identity[file_setting] = [os.path.abspath(full_file_path), file_stat.st_size, file_stat.st_mtime_ns]
+        for setting in ("selected_feature_sets", "era_stride", "training_era_window", "validation_era_window", "compact_dtypes"):
+            identity[setting] = settings[setting]
+        identity["early_stopping"] = (
+            [settings["early_stopping_rounds"], settings["early_stopping_eras"]] if self.early_stopping is not None else None
+        )
+        return identity
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            self.run_sweep()
+        except SweepCancelled:
+            print("Sweep cancelled")
+        except Exception as e:
+            self.failed.emit("Error", f"Results not generated: {e}")
+        finally:
+            if self.experiment_store is not None:
+                self.experiment_store.close()
+                self.experiment_store = None
+            self.finished.emit()
+
+    def run_sweep(self) -> None:
+        settings = self.settings
+        selected_feature_sets = settings["selected_feature_sets"]
+        hyperparameter_rows = self.hyperparameter_rows
+        total = len(hyperparameter_rows)
+
+        # Load training data
+        self.progress.emit("Loading training data", 0, total)
+        train = self.load_training_data(selected_feature_sets, settings["era_stride"], *settings["training_era_window"])
+        if train is None:
+            self.failed.emit("Data Error", "Failed to load training data.")
+            return
+        self.check_cancelled()
+
+        # Load, filter and embargo the validation data once for the whole sweep
+        self.progress.emit("Loading validation data", 0, total)
+        validation_context = self.load_validation_context(selected_feature_sets, settings["validation_file"], train, settings["prediction_batch_size"])
+        if validation_context is None:
+            return
+
+        # Record the sweep in the experiment store, each row is added to it as soon as it is scored
+        try:
+            self.experiment_store = ExperimentStore(settings["dataset_folder"])
+            self.sweep_id = self.experiment_store.start_sweep(settings, validation_context.scoring_context())
+        except Exception as e:
+            print(f"Error opening the experiment store, results of this sweep will not be saved: {e}")
+            self.experiment_store = None
+
+        # Narrow the configurations down on subsets of the training eras before the full-data fits
+        if settings["search_strategy"] in ("Successive halving", "Hyperband"):
+            hyperparameter_rows = self.successive_halving(train, validation_context, hyperparameter_rows)
+            self.hyperparameter_rows = hyperparameter_rows
+            total = len(hyperparameter_rows)
+
+        # Hold out the trailing training eras once for every row when early stopping is on
+        if settings["early_stopping_rounds"] and self.backend.supports_early_stopping:
+            try:
+                self.early_stopping = EarlyStoppingHoldout(
+                    train["era"], train["target"], settings["early_stopping_eras"], settings["early_stopping_rounds"]
+                )
+            except ValueError as ve:
+                self.failed.emit("Early Stopping Error", str(ve))
+                return
+            print(f"Early stopping on {self.early_stopping.holdout_eras} holdout eras from era {self.early_stopping.first_holdout_era}, "
+                  f"fitting on {len(self.early_stopping.fit_rows)} of {len(train)} rows")
+
+        # Rows that only differ in their tree count are scored from one fit with the largest count.
+        # Early stopping picks its own tree count per fit, so every row is fitted on its own then.
+        tree_count_key = self.backend.tree_count_key
+        if self.early_stopping is not None:
+            tree_count_key = None
+
+        # Rows fitted before on the same data, features and settings are scored from the trained model cache
+        self.completed = 0
+        self.trained_model_cache = TrainedModelCache(self.cache_folder_path("trained_models"))
+        training_identity = self.trained_model_identity()
+        self.trained_model_cache_keys = [
+            self.trained_model_cache.key(training_identity, self.backend.name, row) for row in hyperparameter_rows
+        ]
+        uncached_rows = []
+        for i, key in enumerate(self.trained_model_cache_keys):
+            self.check_cancelled()
+            entry = self.trained_model_cache.load(key)
+            if entry is None or len(entry["predictions"]) != len(validation_context.validation):
+                uncached_rows.append(i)
+                continue
+            validation = validation_context.validation[["era", "target"]].copy()
+            validation["prediction"] = entry["predictions"]
+            if not self.score_row(i, entry["model"], validation, validation_context, entry["shared_fit"], entry["fit_seconds"], entry):
+                return
+        if len(uncached_rows) < total:
+            print(f"{total - len(uncached_rows)} of {total} rows loaded from the trained model cache, skipping their fit and prediction")
+
+        shared_fits = [
+            [uncached_rows[k] for k in group]
+            for group in plan_shared_fits([hyperparameter_rows[i] for i in uncached_rows], tree_count_key)
+        ]
+        if len(shared_fits) < len(uncached_rows):
+            print(f"Scoring {len(uncached_rows)} rows from {len(shared_fits)} fits, rows differing only in {tree_count_key} share a fit")
+
+        fit_rows = [hyperparameter_rows[group[0]] for group in shared_fits]
+        for j, model, fit_seconds in self.iter_trained_models(train, selected_feature_sets, fit_rows):
+            self.check_cancelled()
+            group = shared_fits[j]
+            try:
+                # Generate predictions against the out-of-sample validation features,
+                # one column per tree count requested in the group
+                self.progress.emit(f"Predicting model {group[0] + 1} of {total}", self.completed, total)
+                tree_counts = [hyperparameter_rows[i].get(tree_count_key) for i in group] if len(group) > 1 else None
+                validations = validation_context.frames_with_staged_predictions(model, tree_counts)
+            except Exception as e:
+                print(f"Error during validation or prediction: {e}")
+                continue
+
+            shared_fit_note = f"{len(group)} rows share one {tree_count_key}={max(tree_counts)} fit" if len(group) > 1 else None
+            # Score the rows of the group in grid order
+            for i, validation in sorted(zip(group, validations), key=lambda pair: pair[0]):
+                self.check_cancelled()
+                row_model = self.backend.truncate(model, hyperparameter_rows[i].get(tree_count_key)) if len(group) > 1 else model
+                print(validation[["era", "prediction", "target"]])
+                if not self.score_row(i, row_model, validation, validation_context, shared_fit_note, fit_seconds):
+                    return
+
+        self.progress.emit(f"Finished {self.completed} of {total} models", self.completed, total)
+
+    def score_row(self, i, model, validation, validation_context, shared_fit_note=None, fit_seconds=None, cached_entry=None) -> bool:
+        """
+        Scores one grid row on the validation data and sends its result row to the window.
+
+        A freshly fitted row is added to the trained model cache. A row taken from the cache
+        (cached_entry) reuses its stored scores when they were computed against the same
+        meta model file.
+
+        Returns:
+            bool: False when the sweep has to stop because the meta model could not be added.
+        """
+        settings = self.settings
+        hyperparameters_dict = self.hyperparameter_rows[i]
+        total = len(self.hyperparameter_rows)
+        try:
+            # Load performance metric file
+            self.progress.emit(f"Scoring model {i + 1} of {total}", self.completed, total)
+            Performance_validation = self.load_performance_metric_file(validation, settings["meta_model_file"], validation_context)
+            if Performance_validation is None:
+                return False
+            
+            # Compute the per-era corr and mmc against the target and meta model transforms prepared once per sweep
+            scoring_context = validation_context.scoring_context()
+            if cached_entry is not None and cached_entry["meta_model_key"] == validation_context.meta_model_key:
+                per_era_corr, per_era_mmc, summary = cached_entry["scores"]
+            else:
+                per_era_corr, per_era_mmc, summary = scoring_context.score(Performance_validation[["prediction"]])
+            
+        except Exception as e:
+            print(f"Error computing performance metrics: {e}")
+            return True
+        
+        try:
+            # Create a DataFrame to hold the results
+            results_df = pd.DataFrame({
+                'method': [self.backend.name],
+                **{key: [hyperparameters_dict.get(key)] for key in RESULT_HYPERPARAMETER_COLUMNS},
+                'era_stride': [settings["era_stride"]],
+                'best_iteration': [model.best_iteration if self.early_stopping is not None else None],
+                'shared_fit': [shared_fit_note],
+                'fit_seconds': [round(fit_seconds, 3) if fit_seconds is not None else None],
+                'cached': [cached_entry is not None],
+                **{column: [summary.at["prediction", column]] for column in RESULT_SCORE_COLUMNS}
+            })
+
+            if model is not None:
+                # Hand the finished row to the window, which stores it and adds it to the results table
+                model_result = ModelResult(
+                    results_df, model, hyperparameters_dict, Performance_validation["prediction"].to_numpy(),
+                    per_era_corr["prediction"], per_era_mmc["prediction"], scoring_context, settings["selected_feature_sets"]
+                )
+                if cached_entry is None:
+                    self.trained_model_cache.store(self.trained_model_cache_keys[i], {
+                        "model": model,
+                        "predictions": model_result.predictions,
+                        "scores": (per_era_corr, per_era_mmc, summary),
+                        "meta_model_key": validation_context.meta_model_key,
+                        "shared_fit": shared_fit_note,
+                        "fit_seconds": fit_seconds,
+                    })
+                if self.experiment_store is not None:
+                    try:
+                        model_result.result_id = self.experiment_store.add_result(self.sweep_id, model_result)
+                    except Exception as e:
+                        print(f"Error saving the result to the experiment store: {e}")
+                self.model_ready.emit(model_result)
+
+        except Exception as e:
+            print(f"Error storing model data: {e}")
+            return True
+
+        self.completed += 1
+        self.progress.emit(f"Finished model {i + 1} of {total}", self.completed, total)
+        return True
+
+    def successive_halving(self, train, validation_context, hyperparameter_rows) -> list:
+        """
+        Narrows the configurations down by successive halving before the full-data sweep.
+
+        Each round fits the remaining configurations on every k-th training era, counted
+        back from the most recent one, and ranks them by their mean per-era validation
+        correlation. Only the best 1/halving_factor move on to the next round, which
+        uses halving_factor times more eras. The survivors of the last round are returned
+        and fitted on the full training data by the normal sweep.
+
+        With Hyperband the configurations are split into brackets that start from
+        different era subsets, from many configurations on few eras to a few
+        configurations on all eras, and the survivors of every bracket are returned.
+        """
+        halving_factor = self.settings["halving_factor"]
+        era_count = len(np.unique(np.asarray(train["era"]).astype(str)))
+
+        # Rounds before the full-data fits, limited by the configurations and the smallest era subset
+        rounds = 0
+        while (len(hyperparameter_rows) >= halving_factor ** (rounds + 1)
+               and era_count / halving_factor ** (rounds + 1) >= HALVING_MIN_ERAS):
+            rounds += 1
+        if rounds == 0:
+            print("Too few configurations or training eras for successive halving, fitting every configuration on all eras")
+            return hyperparameter_rows
+
+        # Vectorized per-era correlation on the validation rows that have a target
+        validation = validation_context.validation
+        scoring_context = validation_context.scoring_context()
+        scored_rows = scoring_context.correlation_rows
+        correlation = scoring_context.correlation
+
+        if self.settings["search_strategy"] == "Hyperband":
+            # Bracket s trains on s rounds of era subsets and gets configurations in proportion
+            # to the Hyperband bracket size ceil((rounds + 1) / (s + 1) * factor ** s)
+            bracket_sizes = [math.ceil((rounds + 1) / (s + 1) * halving_factor ** s) for s in range(rounds, -1, -1)]
+            shuffled_rows = random.Random(0).sample(hyperparameter_rows, len(hyperparameter_rows))
+            boundaries = np.round(np.cumsum([0] + bracket_sizes) / sum(bracket_sizes) * len(shuffled_rows)).astype(int)
+            brackets = [
+                (s, shuffled_rows[boundaries[k]:boundaries[k + 1]])
+                for k, s in enumerate(range(rounds, -1, -1))
+            ]
+        else:
+            brackets = [(rounds, hyperparameter_rows)]
+
+        survivors = []
+        training_data_key = self.training_data_key
+        try:
+            for bracket_rounds, bracket_rows in brackets:
+                for round_number in range(bracket_rounds):
+                    if not bracket_rows:
+                        break
+                    era_step = halving_factor ** (bracket_rounds - round_number)
+                    kept_eras = np.unique(np.asarray(train["era"]).astype(str))[::-1][::era_step]
+                    round_train = train[train["era"].astype(str).isin(kept_eras)]
+                    self.training_data_key = f"{training_data_key}_halving{era_step}"
+                    print(f"Halving round {round_number + 1} of {bracket_rounds}: {len(bracket_rows)} configurations on {len(kept_eras)} eras")
+
+                    scores = np.full(len(bracket_rows), -np.inf)
+                    for j, model, _ in self.iter_trained_models(round_train, self.settings["selected_feature_sets"], bracket_rows):
+                        self.check_cancelled()
+                        predictions = predict_in_batches(
+                            model, validation, self.settings["selected_feature_sets"], self.settings["prediction_batch_size"], self.backend
+                        )
+                        scores[j] = np.nan_to_num(correlation.per_era_correlation(predictions[scored_rows])).mean()
+
+                    kept = np.sort(np.argsort(-scores, kind="stable")[:math.ceil(len(bracket_rows) / halving_factor)])
+                    for j in np.argsort(-scores, kind="stable"):
+                        print(f"{'kept' if j in kept else 'dropped'} {scores[j]:.6f} {bracket_rows[j]}")
+                    bracket_rows = [bracket_rows[j] for j in kept if np.isfinite(scores[j])]
+                survivors.extend(bracket_rows)
+        finally:
+            self.training_data_key = training_data_key
+
+        print(f"{len(survivors)} of {len(hyperparameter_rows)} configurations move on to the full training data")
+        return survivors
+
+    def iter_trained_models(self, train, selected_feature_sets, hyperparameter_rows):
+        """
+        Yields (row index, model, fit seconds) for every row of hyperparameter_rows that
+        trained successfully.
+
+        Rows are trained one at a time on this thread, or on a process pool when more than
+        one process is requested and the backend supports it, in which case models are
+        yielded in the order they finish.
+        """
+        total = len(hyperparameter_rows)
+        if self.settings["parallel_processes"] > 1 and self.backend.supports_process_pool:
+            self.progress.emit(f"Training {total} models in parallel", 0, total)
+            executor = ParallelSweepExecutor(self.settings["parallel_processes"], self.cache_folder_path("shared_training"))
+            yield from executor.iter_train_lightgbm(
+                self.training_data_key, train, selected_feature_sets, hyperparameter_rows,
+                binary_folder=self.cache_folder_path("lightgbm_datasets"), cancel_event=self.cancel_event,
+                early_stopping=self.early_stopping
+            )
+            return
+
+        for i, hyperparameters_dict in enumerate(hyperparameter_rows):
+            self.check_cancelled()
+            self.progress.emit(f"Training model {i + 1} of {total}", i, total)
+            fit_start = time.perf_counter()
+            try:
+                model = self.train_model_with_hyperparameters(hyperparameters_dict, selected_feature_sets, train)
+            except SweepCancelled:
+                raise
+            except Exception as e:
+                print(f"Error training model with hyperparameters {hyperparameters_dict}: {e}")
+                continue
+            yield i, model, time.perf_counter() - fit_start
+
+    def train_model_with_hyperparameters(self, hyperparameters, selected_feature_sets, train):
+        """
+        Train a model with specified hyperparameters through the backend of the selected
+        training method.
+
+        Args:
+            hyperparameters (dict): Dictionary containing hyperparameter values.
+            selected_feature_sets (list): List of selected feature sets.
+            train (pd.DataFrame): Training data.
+
+        Returns:
+            object: Trained model, None if training failed.
+        """
+        try:
+            return self.backend.fit(hyperparameters, train, selected_feature_sets, self)
+        except SweepCancelled:
+            raise
+        except Exception as e:
+            self.failed.emit("Error", f"Error training model: {e}")
+            return None
+    
+    def load_validation_data(self, selected_feature_sets, selected_validation_file, eras_to_exclude=None, era_start=None, era_end=None):
+        """
+        Loads the validation rows of the validation file.
+
+        The data_type filter and the era filters are pushed down to the parquet reader,
+        so row groups that cannot match are skipped using their statistics and test rows
+        or excluded eras are never decoded.
+
+        Args:
+            selected_feature_sets (list): Selected feature sets.
+            selected_validation_file (str): Validation file relative to the dataset folder.
+            eras_to_exclude (list, optional): Eras to drop, e.g. the embargoed eras.
+            era_start (str, optional): First era to keep.
+            era_end (str, optional): Last era to keep.
+
+        Returns:
+            pd.DataFrame or None: Loaded validation data if successful, None otherwise.
+        """
+        file_extension = os.path.splitext(selected_validation_file)[1].lower()
+        full_file_path = os.path.join(self.settings["dataset_folder"], selected_validation_file)
+
+        try:
+            if file_extension == ".parquet":
+                # Ensure selected_feature_sets is a list of column names
+                if not isinstance(selected_feature_sets, list):
+                    raise ValueError("selected_feature_sets should be a list of column names.")
+
+                filter_expression = ds.field("data_type") == "validation"
+                era_expression = era_filter_expression(eras_to_exclude=eras_to_exclude, era_start=era_start, era_end=era_end)
+                if era_expression is not None:
+                    filter_expression = filter_expression & era_expression
+
+                # Attempt to read the parquet file
+                validation = read_numerai_parquet(
+                    full_file_path,
+                    ["era", "target"] + selected_feature_sets,
+                    compact=self.settings["compact_dtypes"],
+                    filter_expression=filter_expression
+                )
+                return validation
+            else:
+                raise ValueError("Unsupported file format.")
+        except FileNotFoundError:
+            self.failed.emit("Error", f"File not found: {full_file_path}")
+        except pd.errors.EmptyDataError:
+            self.failed.emit("Error", "No data found in the file.")
+        except ValueError as ve:
+            self.failed.emit("Error", f"ValueError: {ve}")
+        except Exception as e:
+            self.failed.emit("Error", f"Error loading dataset: {e}")
+        
+        return None
+
+    def load_validation_context(self, selected_feature_sets, selected_validation_file, train, prediction_batch_size=PREDICTION_BATCH_SIZE):
+        """
+        Loads the validation data once for a sweep, keeping only the validation rows
+        inside the optional era window and dropping the eras embargoed after the last
+        training era.
+
+        Args:
+            selected_feature_sets (list): Selected feature sets.
+            selected_validation_file (str): Validation file relative to the dataset folder.
+            train (pd.DataFrame): Training data, used to find the last training era.
+            prediction_batch_size (int): Rows predicted at once for each model.
+
+        Returns:
+            ValidationContext or None: Shared validation data if successful, None otherwise.
+        """
+        era_window = self.settings["validation_era_window"]
+
+        # Eras are 1 week apart, but targets look 20 days (or 4 weeks/eras) into the future,
+        # so we need to "embargo" the first 4 eras following our last train era to avoid "data leakage"
+        last_train_era = int(train["era"].unique()[-1])
+        eras_to_embargo = [str(era).zfill(4) for era in [last_train_era + i for i in range(4)]]
+
+        validation = self.load_validation_data(selected_feature_sets, selected_validation_file, eras_to_embargo, *era_window)
+        if validation is None:
+            return None
+
+        self.table_ready.emit(validation, "table_widget_validation_dataset")
+        return ValidationContext(validation, selected_feature_sets, prediction_batch_size, self.backend)
+
+    def load_performance_metric_file(self, validation, selected_performance_file, validation_context):
+        """
+        Adds the meta model column to a model's validation frame.
+
+        The meta model is read and aligned to the validation ids once per sweep by the
+        validation context, so every model after the first reuses the aligned series.
+
+        Args:
+            validation (pd.DataFrame): Validation frame built by validation_context.
+            selected_performance_file (str): Meta model file relative to the dataset folder.
+            validation_context (ValidationContext): Validation data shared by the sweep.
+
+        Returns:
+            pd.DataFrame or None: Validation frame with a meta_model column if successful, None otherwise.
+        """
+        file_extension = os.path.splitext(selected_performance_file)[1].lower()
+        full_file_path = os.path.join(self.settings["dataset_folder"], selected_performance_file)
+        try:
+            if file_extension == ".parquet":
+                # Ensure that the 'meta_model' column is not already present
+                if 'meta_model' in validation.columns:
+                    self.failed.emit("Warning", "Meta model column already exists in the validation data.")
+                    return None
+                
+                # Add the meta_model column to the validation DataFrame, which shares the context row order
+                validation["meta_model"] = validation_context.aligned_meta_model(full_file_path).to_numpy()
+                
+                # Update the table with performance metrics
+                self.table_ready.emit(validation, "table_widget_metamodel_performance_file")
+                return validation
+            else:
+                raise ValueError("Unsupported file format.")
+            
+        except FileNotFoundError:
+            self.failed.emit("Error", f"File not found: {full_file_path}")
+        except pd.errors.EmptyDataError:
+            self.failed.emit("Error", "No data found in the file.")
+        except ValueError as ve:
+            self.failed.emit("Error", f"ValueError: {ve}")
+        except KeyError:
+            self.failed.emit("Error", "Expected column 'numerai_meta_model' not found in the file.")
+        except Exception as e:
+            self.failed.emit("Error", f"Error loading performance metric file: {e}")
+        
+        return None
+                  
+    def load_training_data(self, selected_feature_sets, era_stride=1, era_start=None, era_end=None):
+        """
+        Loads training data based on the selected feature sets.
+
+        The era window and stride are applied at read time: only the era column is scanned
+        to pick every era_stride-th era, and the remaining rows are filtered out by the
+        parquet reader before the frame is built.
+
+        Args:
+            selected_feature_sets (list): Selected feature sets.
+            era_stride (int): Keep every era_stride-th era, 1 keeps every era.
+            era_start (str, optional): First training era to keep.
+            era_end (str, optional): Last training era to keep.
+
+        Returns:
+            pd.DataFrame or None: Loaded training data if successful, None otherwise.
+        """
+        selected_training_file = self.settings["training_file"]
+        file_extension = os.path.splitext(selected_training_file)[1].lower()
+        full_file_path = os.path.join(self.settings["dataset_folder"], selected_training_file)
+
+        try:
+            if file_extension == ".parquet":
+                # Reuse the prepared frame from the on-disk cache when the source file and options are unchanged
+                compact = self.settings["compact_dtypes"]
+                prepared_frame_cache = PreparedFrameCache(self.cache_folder_path("prepared_frames"))
+                cache_key = prepared_frame_cache.key(
+                    full_file_path, self.settings["feature_set_name"], ["era", "target"] + selected_feature_sets,
+                    compact=compact, era_stride=era_stride, era_start=era_start, era_end=era_end
+                )
+                train = prepared_frame_cache.load(cache_key)
+                self.training_data_key = cache_key
+                if train is not None:
+                    print(f"Loaded prepared training frame from cache: {cache_key}")
+                    self.table_ready.emit(train, "table_widget_train_dataset")
+                    return train
+
+                filter_expression = era_filter_expression(era_start=era_start, era_end=era_end)
+                if era_stride > 1:
+                    eras_to_keep = select_strided_eras(full_file_path, era_stride, filter_expression)
+                    filter_expression = era_filter_expression(eras_to_keep=eras_to_keep)
+                    print(f"Training on {len(eras_to_keep)} eras with an era stride of {era_stride}")
+
+                # Load the training data from the parquet file
+                train = read_numerai_parquet(
+                    full_file_path,
+                    ["era", "target"] + selected_feature_sets,
+                    compact=compact,
+                    filter_expression=filter_expression
+                )
+                prepared_frame_cache.store(cache_key, train)
+                self.table_ready.emit(train, "table_widget_train_dataset")
+                logging.debug('Loaded training data successfully')
+                return train
+            else:
+                raise ValueError("Unsupported file format. Only .parquet files are supported.")
+        except FileNotFoundError:
+            self.failed.emit("Error", f"File not found: {full_file_path}")
+        except pd.errors.EmptyDataError:
+            self.failed.emit("Error", "No data found in the file.")
+        except ValueError as ve:
+            self.failed.emit("Error", f"ValueError: {ve}")
+        except Exception as e:
+            self.failed.emit("Error", f"Error loading dataset: {e}")
+
+        return None
+
+class StdoutRedirector(QObject):
+    """
+    Sends printed text to the terminal widget. Text printed from a worker thread is
+    delivered through a queued signal, so the widget is only touched on the GUI thread.
+    """
+    text_written = Signal(str)
+
     def __init__(self, text_widget):
+        super().__init__()
         self.text_widget = text_widget
+        self.text_written.connect(self.append_text)
  
     def write(self, message):
+        self.text_written.emit(message)
+
+    @Slot(str)
+    def append_text(self, message):
         self.text_widget.append(message)  # Use appendPlainText to avoid extra white spaces
         self.text_widget.ensureCursorVisible()  # Ensure cursor is visible
         
     def flush(self):
         pass
 
-class StderrRedirector:
+class StderrRedirector(QObject):
+    """
+    Sends error output to the terminal widget in red, through a queued signal like StdoutRedirector.
+    """
+    text_written = Signal(str)
 
     def __init__(self, text_widget):
+        super().__init__()
         self.text_widget = text_widget
         self.suppress_errors = False  # Flag to control error suppression
+        self.text_written.connect(self.append_text)
 
     def write(self, message):
         # Check if we need to suppress errors based on the message content
         if self.suppress_errors and "Error" in message:
             return  # Suppress this message
+        self.text_written.emit(message)
 
+    @Slot(str)
+    def append_text(self, message):
         # Apply a custom style for error messages
         self.text_widget.append(f'<span style="color:red;">{message}</span>')
         self.text_widget.ensureCursorVisible()  # Ensure cursor is visible
@@ -0,0 +1,221 @@
+"""
+Benchmarks of the vectorized scoring and model code in NumerAiTest against the reference
+implementations they replace.
+
+Run from the repository folder, for example:
+    python benchmarks.py corr --eras 600 --rows-per-era 5000
+"""
+import argparse
+import time
+
+import cloudpickle
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from numerai_tools.scoring import numerai_corr, correlation_contribution
+
+import NumerAiTest
+from NumerAiTest import (
+    RESULT_SCORE_COLUMNS, ModelWithPredictMethod, NativeModelPredictor, ScoringContext,
+    per_era_numerai_corr, per_era_correlation_contribution,
+)
+
+
+def synthetic_validation(eras, rows_per_era, models=1, seed=0):
+    """
+    Validation-like frame with Numerai style targets, tied float32 predictions, a meta model
+    and a few missing targets and meta model values. The first prediction column is named
+    "prediction", the others "prediction_1" and so on.
+    """
+    rng = np.random.default_rng(seed)
+    rows = eras * rows_per_era
+    target = rng.choice([0.0, 0.25, 0.5, 0.75, 1.0], size=rows, p=[0.05, 0.2, 0.5, 0.2, 0.05])
+    target[rng.random(rows) < 0.01] = np.nan
+    signal = np.nan_to_num(target, nan=0.5)
+    meta_model = np.round(0.1 * signal + rng.normal(size=rows), 3)
+    meta_model[rng.random(rows) < 0.01] = np.nan
+    frame = pd.DataFrame({
+        "era": np.repeat([str(era).zfill(4) for era in range(1, eras + 1)], rows_per_era),
+        "target": target,
+        "meta_model": meta_model,
+    }, index=pd.Index([f"id{i}" for i in range(rows)], name="id"))
+    for model in range(models):
+        column = "prediction" if model == 0 else f"prediction_{model}"
+        frame[column] = np.round(0.1 * signal + rng.normal(size=rows), 2).astype(np.float32)
+    return frame
+
+
+def timed(function, repeat):
+    """
+    Returns the result of function and its best wall time over repeat runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def benchmark_corr(args):
+    frame = synthetic_validation(args.eras, args.rows_per_era)
+
+    reference, reference_seconds = timed(lambda: frame.groupby("era").apply(
+        lambda x: numerai_corr(x[["prediction"]].dropna(), x["target"].dropna())
+    ), args.repeat)
+    vectorized, vectorized_seconds = timed(lambda: per_era_numerai_corr(
+        frame["prediction"], frame["target"], frame["era"]
+    ), args.repeat)
+
+    difference = np.abs(reference["prediction"].to_numpy() - vectorized["prediction"].to_numpy()).max()
+    assert reference.index.equals(vectorized.index), "Eras differ"
+    assert difference < 1e-12, f"Per-era CORR differs by {difference}"
+    print(f"Per-era CORR over {args.eras} eras x {args.rows_per_era} rows")
+    print(f"  numerai_tools groupby: {reference_seconds:.3f}s")
+    print(f"  vectorized:            {vectorized_seconds:.3f}s ({reference_seconds / vectorized_seconds:.1f}x)")
+    print(f"  max abs difference:    {difference:.2e}")
+
+
+def benchmark_mmc(args):
+    frame = synthetic_validation(args.eras, args.rows_per_era, models=args.models)
+    columns = [column for column in frame.columns if column.startswith("prediction")]
+
+    reference, reference_seconds = timed(lambda: frame.dropna().groupby("era").apply(
+        lambda x: correlation_contribution(x[columns], x["meta_model"], x["target"])
+    ), args.repeat)
+    vectorized, vectorized_seconds = timed(lambda: per_era_correlation_contribution(
+        frame[columns], frame["meta_model"], frame["target"], frame["era"]
+    ), args.repeat)
+
+    difference = np.abs(reference[columns].to_numpy() - vectorized[columns].to_numpy()).max()
+    assert reference.index.equals(vectorized.index), "Eras differ"
+    assert difference < 1e-9, f"Per-era MMC differs by {difference}"
+    print(f"Per-era MMC of {len(columns)} models over {args.eras} eras x {args.rows_per_era} rows")
+    print(f"  numerai_tools groupby: {reference_seconds:.3f}s")
+    print(f"  vectorized:            {vectorized_seconds:.3f}s ({reference_seconds / vectorized_seconds:.1f}x)")
+    print(f"  max abs difference:    {difference:.2e}")
+
+
+def benchmark_context(args):
+    frame = synthetic_validation(args.eras, args.rows_per_era, models=args.models)
+    columns = [column for column in frame.columns if column.startswith("prediction")]
+
+    def score_standalone():
+        return [
+            (per_era_numerai_corr(frame[column], frame["target"], frame["era"]),
+             per_era_correlation_contribution(frame[column], frame["meta_model"], frame["target"], frame["era"]))
+            for column in columns
+        ]
+
+    def score_with_context():
+        scoring_context = ScoringContext(frame["era"], frame["target"], frame["meta_model"])
+        return [(scoring_context.per_era_corr(frame[column]), scoring_context.per_era_mmc(frame[column])) for column in columns]
+
+    standalone, standalone_seconds = timed(score_standalone, args.repeat)
+    with_context, context_seconds = timed(score_with_context, args.repeat)
+
+    difference = max(
+        np.abs(a.to_numpy() - b.to_numpy()).max()
+        for pair, context_pair in zip(standalone, with_context) for a, b in zip(pair, context_pair)
+    )
+    assert difference < 1e-12, f"Scoring context differs by {difference}"
+    print(f"Per-model CORR and MMC of {len(columns)} models over {args.eras} eras x {args.rows_per_era} rows")
+    print(f"  standalone scorers: {standalone_seconds:.3f}s")
+    print(f"  scoring context:    {context_seconds:.3f}s ({standalone_seconds / context_seconds:.1f}x)")
+    print(f"  max abs difference: {difference:.2e}")
+
+
+def benchmark_batch(args):
+    frame = synthetic_validation(args.eras, args.rows_per_era, models=args.models)
+    columns = [column for column in frame.columns if column.startswith("prediction")]
+
+    def score_one_by_one():
+        # One groupby pass per model and metric, as the results table was filled before batch scoring
+        rows = []
+        for column in columns:
+            model_frame = frame[["era", "target", "meta_model", column]].rename(columns={column: "prediction"})
+            per_era = {
+                "corr": model_frame.groupby("era").apply(
+                    lambda x: numerai_corr(x[["prediction"]].dropna(), x["target"].dropna())
+                )["prediction"],
+                "mmc": model_frame.dropna().groupby("era").apply(
+                    lambda x: correlation_contribution(x[["prediction"]], x["meta_model"], x["target"])
+                )["prediction"],
+            }
+            row = {}
+            for metric, scores in per_era.items():
+                row[f"{metric}_mean"] = scores.mean()
+                row[f"{metric}_std"] = scores.std(ddof=0)
+                row[f"{metric}_sharpe"] = row[f"{metric}_mean"] / row[f"{metric}_std"]
+                row[f"{metric}_max_drawdown"] = (scores.cumsum().expanding(min_periods=1).max() - scores.cumsum()).max()
+            rows.append(row)
+        return pd.DataFrame(rows, index=columns)[RESULT_SCORE_COLUMNS]
+
+    def score_batch():
+        return ScoringContext(frame["era"], frame["target"], frame["meta_model"]).score(frame[columns])[2]
+
+    one_by_one, one_by_one_seconds = timed(score_one_by_one, args.repeat)
+    batch, batch_seconds = timed(score_batch, args.repeat)
+
+    difference = np.abs(one_by_one.to_numpy() - batch.to_numpy()).max()
+    assert difference < 1e-9, f"Batch scores differ by {difference}"
+    print(f"Summary CORR and MMC statistics of {len(columns)} models over {args.eras} eras x {args.rows_per_era} rows")
+    print(f"  one groupby pass per model: {one_by_one_seconds:.3f}s")
+    print(f"  batch scoring:              {batch_seconds:.3f}s ({one_by_one_seconds / batch_seconds:.1f}x)")
+    print(f"  max abs difference:         {difference:.2e}")
+
+
+def benchmark_export(args):
+    rng = np.random.default_rng(0)
+    feature_names = [f"feature_{i}" for i in range(args.features)]
+    train = pd.DataFrame(rng.integers(0, 5, size=(args.eras * 100, args.features), dtype=np.int8), columns=feature_names)
+    target = 0.05 * train.iloc[:, :10].sum(axis=1) + rng.normal(size=len(train))
+    model = lgb.train(
+        {"learning_rate": 0.05, "num_leaves": 31, "colsample_bytree": 0.5, "verbose": -1},
+        lgb.Dataset(train, target), num_boost_round=args.trees
+    )
+    live = pd.DataFrame(rng.integers(0, 5, size=(args.rows_per_era, args.features), dtype=np.int8), columns=feature_names)
+
+    # The app runs as a script, so its classes are pickled by value; do the same when imported
+    cloudpickle.register_pickle_by_value(NumerAiTest)
+    pickled = cloudpickle.dumps(ModelWithPredictMethod(model, feature_names).predict)
+    lean = cloudpickle.dumps(NativeModelPredictor(model.model_to_string(), feature_names).predict)
+
+    _, pickled_load_seconds = timed(lambda: cloudpickle.loads(pickled), args.repeat)
+    _, lean_load_seconds = timed(lambda: cloudpickle.loads(lean), args.repeat)
+    reference, pickled_seconds = timed(lambda: cloudpickle.loads(pickled)(live), args.repeat)
+    lean_predictions, lean_seconds = timed(lambda: cloudpickle.loads(lean)(live), args.repeat)
+
+    difference = np.abs(reference["prediction"].to_numpy() - lean_predictions["prediction"].to_numpy()).max()
+    assert reference.index.equals(lean_predictions.index), "Live ids differ"
+    # ModelWithPredictMethod rounds its predictions to float32
+    assert difference < 1e-6, f"Lean predictions differ by {difference}"
+    print(f"Submission pickle of a {args.trees} tree LightGBM model on {args.features} features, {args.rows_per_era} live rows")
+    print(f"  ModelWithPredictMethod pickle: {len(pickled) / 1024:.0f} KiB, load {pickled_load_seconds:.3f}s, load + predict {pickled_seconds:.3f}s")
+    print(f"  lean native pickle:            {len(lean) / 1024:.0f} KiB, load {lean_load_seconds:.3f}s, load + predict {lean_seconds:.3f}s")
+    print(f"  size ratio:                    {len(pickled) / len(lean):.1f}x smaller, load + predict {pickled_seconds / lean_seconds:.1f}x")
+    print(f"  max abs difference:            {difference:.2e}")
+
+
+BENCHMARKS = {
+    "corr": benchmark_corr,
+    "mmc": benchmark_mmc,
+    "context": benchmark_context,
+    "batch": benchmark_batch,
+    "export": benchmark_export,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=list(BENCHMARKS) + ["all"])
+    parser.add_argument("--eras", type=int, default=600)
+    parser.add_argument("--rows-per-era", type=int, default=5000)
+    parser.add_argument("--models", type=int, default=5, help="Prediction columns scored together by the batched benchmarks")
+    parser.add_argument("--features", type=int, default=500, help="Feature columns of the exported model")
+    parser.add_argument("--trees", type=int, default=2000, help="Boosted trees of the exported model")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for name, benchmark in BENCHMARKS.items():
+        if args.benchmark in (name, "all"):
+            benchmark(args)